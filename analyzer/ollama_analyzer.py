@@ -6,6 +6,7 @@ Ollama AI analyzer optimized for gemma3:1b for live football betting analysis
 import json
 import logging
 import requests
+import aiohttp
 import asyncio
 import hashlib
 import time
@@ -14,6 +15,25 @@ from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _dumps(obj: Any) -> bytes:
+    """JSON-encode a request body, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+# Response bodies are parsed straight from bytes
+_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
 
 @dataclass
 class AnalysisResult:
@@ -43,10 +63,15 @@ class OllamaAnalyzer:
         self.api_url = f"{base_url}/api/generate"
         self._available = False
         self._check_connection()
+        # Shared aiohttp session injected by the agent; falls back to
+        # blocking requests in a worker thread when unset
+        self.http: Optional[aiohttp.ClientSession] = None
         
         # Cache for analysis results (don't re-analyze same game state)
         self._cache: Dict[str, AnalysisResult] = {}
         self._cache_ttl = 30  # seconds
+        # Requests currently running, so identical game states share one call
+        self._inflight: Dict[str, asyncio.Future] = {}
     
     def _check_connection(self):
         """Check if Ollama is available"""
@@ -82,15 +107,29 @@ class OllamaAnalyzer:
             cached = self._cache[cache_key]
             # Check if cache is still valid
             if time.time() - getattr(cached, '_cache_time', 0) < self._cache_ttl:
-                logger.debug(f"Using cached analysis for {game_data.get('home_team')} vs {game_data.get('away_team')}")
+                logger.debug("Using cached analysis for %s vs %s", game_data.get('home_team'), game_data.get('away_team'))
                 return cached
-        
+
+        # Join an identical request that is already running
+        inflight = self._inflight.get(cache_key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._analyze_uncached(cache_key, game_data))
+            self._inflight[cache_key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        # Shielded so one caller being cancelled doesn't cancel the others
+        return await asyncio.shield(inflight)
+
+    async def _analyze_uncached(self, cache_key: str, game_data: Dict[str, Any]) -> AnalysisResult:
+        """Query Ollama for one game state and cache the parsed result."""
         # Build prompt for gemma3
         prompt = self._build_prompt(game_data)
         
         try:
-            # Run blocking request in thread pool
-            response = await asyncio.to_thread(self._query_ollama, prompt)
+            if self.http and not self.http.closed:
+                response = await self._query_ollama_async(prompt)
+            else:
+                # Run blocking request in thread pool
+                response = await asyncio.to_thread(self._query_ollama, prompt)
             result = self._parse_response(response)
             
             # Cache the result
@@ -116,9 +155,9 @@ class OllamaAnalyzer:
         key_string = "|".join(key_parts)
         return hashlib.md5(key_string.encode()).hexdigest()
     
-    def _query_ollama(self, prompt: str) -> str:
-        """Make request to Ollama"""
-        payload = {
+    def _build_payload(self, prompt: str) -> Dict[str, Any]:
+        """Ollama /api/generate request body"""
+        return {
             "model": self.model,
             "prompt": prompt,
             "stream": False,
@@ -128,16 +167,42 @@ class OllamaAnalyzer:
                 "num_predict": 512,  # Limit response length for speed
             }
         }
+
+    async def _query_ollama_async(self, prompt: str) -> str:
+        """Make request to Ollama over the shared aiohttp session"""
+        try:
+            async with self.http.post(
+                self.api_url,
+                data=_dumps(self._build_payload(prompt)),
+                headers=JSON_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=30),
+            ) as response:
+                if response.status == 200:
+                    result = _loads(await response.read())
+                    return result.get("response", "")
+                logger.error(f"Ollama error {response.status}: {await response.text()}")
+                return ""
+        except asyncio.TimeoutError:
+            logger.warning("Ollama request timed out")
+            return ""
+        except Exception as e:
+            logger.error(f"Ollama connection error: {e}")
+            return ""
+
+    def _query_ollama(self, prompt: str) -> str:
+        """Make request to Ollama"""
+        payload = self._build_payload(prompt)
         
         try:
             response = requests.post(
                 self.api_url, 
-                json=payload, 
+                data=_dumps(payload),
+                headers=JSON_HEADERS,
                 timeout=30  # Increased for gemma3:1b
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = _loads(response.content)
                 return result.get("response", "")
             else:
                 logger.error(f"Ollama error {response.status_code}: {response.text}")
@@ -13,9 +13,10 @@ Given expected goals (lambda), P(k goals) = e^(-λ) * λ^k / k!
 """
 
 import math
+from collections import OrderedDict
 import numpy as np
 from scipy.stats import poisson
-from typing import Tuple, Dict, Optional
+from typing import Tuple, Dict, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -34,16 +35,25 @@ class PoissonModel:
     DEFAULT_HOME_LAMBDA = 1.55
     DEFAULT_AWAY_LAMBDA = 1.15
 
+    # Memoized predictions, keyed by (home, away, home_score, away_score, minute)
+    CACHE_SIZE = 4096
+
     def __init__(self):
         # Team attack/defense strength relative to league average
         # Format: { "Team Name": {"attack": 1.2, "defense": 0.8} }
         self.team_ratings: Dict[str, Dict] = {}
         self.league_home_avg = self.DEFAULT_HOME_LAMBDA
         self.league_away_avg = self.DEFAULT_AWAY_LAMBDA
+        self._cache: "OrderedDict[Tuple, Tuple[Dict[str, float], int, int]]" = OrderedDict()
+        self.ratings_version = 0  # Bumped on every ratings update
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def update_team_ratings(self, ratings: Dict):
         """Update team attack/defense ratings from stats fetcher."""
         self.team_ratings.update(ratings)
+        self.ratings_version += 1
+        self._cache.clear()  # cached predictions used the old ratings
 
     def get_expected_goals(self, home_team: str, away_team: str) -> Tuple[float, float]:
         """
@@ -54,8 +64,9 @@ class PoissonModel:
         
         Returns: (home_xg, away_xg)
         """
-        home_r = self.team_ratings.get(home_team, {"attack": 1.0, "defense": 1.0})
-        away_r = self.team_ratings.get(away_team, {"attack": 1.0, "defense": 1.0})
+        # Ratings are keyed by lower-cased team name (see StatsFetcher)
+        home_r = self.team_ratings.get(home_team.lower(), {"attack": 1.0, "defense": 1.0})
+        away_r = self.team_ratings.get(away_team.lower(), {"attack": 1.0, "defense": 1.0})
 
         home_xg = self.league_home_avg * home_r["attack"] * away_r["defense"]
         away_xg = self.league_away_avg * away_r["attack"] * home_r["defense"]
@@ -107,13 +118,47 @@ class PoissonModel:
         Build a matrix of P(home_goals=i, away_goals=j).
         Matrix[i][j] = probability of home scoring i, away scoring j.
         """
-        matrix = np.zeros((max_goals + 1, max_goals + 1))
-        for i in range(max_goals + 1):
-            for j in range(max_goals + 1):
-                p_home = poisson.pmf(i, home_xg)
-                p_away = poisson.pmf(j, away_xg)
-                matrix[i][j] = p_home * p_away
-        return matrix
+        goals = np.arange(max_goals + 1)
+        return np.outer(poisson.pmf(goals, home_xg), poisson.pmf(goals, away_xg))
+
+    def predict(
+        self,
+        home_team: str,
+        away_team: str,
+        home_score: int = 0,
+        away_score: int = 0,
+        minute: int = 0,
+    ) -> Tuple[Dict[str, float], int, int]:
+        """
+        Main method: returns (probabilities, predicted_home, predicted_away).
+
+        Memoized per match state; the minute is part of the key, so entries
+        go stale naturally as the game moves on. Callers must not mutate
+        the returned dict.
+        """
+        key = (home_team, away_team, home_score, away_score, minute)
+        result = self.cached(key)
+        if result is None:
+            result = self._compute(home_team, away_team, home_score, away_score, minute)
+            self.remember(key, result)
+        return result
+
+    def cached(self, key: Tuple) -> Optional[Tuple[Dict[str, float], int, int]]:
+        """Return the memoized prediction for `key` without computing it."""
+        result = self._cache.get(key)
+        if result is None:
+            self.cache_misses += 1
+        else:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+        return result
+
+    def remember(self, key: Tuple, result: Tuple[Dict[str, float], int, int]):
+        """Store a prediction computed elsewhere (e.g. in a worker process)."""
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
 
     def get_all_probabilities(
         self,
@@ -124,8 +169,8 @@ class PoissonModel:
         minute: int = 0,
     ) -> Dict[str, float]:
         """
-        Main method: returns all bet-relevant probabilities.
-        
+        Returns all bet-relevant probabilities.
+
         Returns dict with:
           - home_win, draw, away_win (1X2)
           - over_25, under_25 (total goals)
@@ -133,6 +178,13 @@ class PoissonModel:
           - btts (both teams to score)
           - home_win_prob, draw_prob, away_win_prob (% values 0-100)
         """
+        return self.predict(home_team, away_team, home_score, away_score, minute)[0]
+
+    def _compute(
+        self, home_team: str, away_team: str,
+        home_score: int, away_score: int, minute: int
+    ) -> Tuple[Dict[str, float], int, int]:
+        """Build the score matrix once and derive probabilities and the likeliest score."""
         base_home_xg, base_away_xg = self.get_expected_goals(home_team, away_team)
 
         # Adjust for live match state
@@ -146,10 +198,11 @@ class PoissonModel:
         # Handle edge case: minimal remaining time
         if home_xg < 0.01 and away_xg < 0.01:
             # Game essentially over, go by current score
-            return self._final_probabilities(home_score, away_score)
+            return self._final_probabilities(home_score, away_score), home_score, away_score
 
         # Build probability matrix
         matrix = self.score_probability_matrix(home_xg, away_xg)
+        add_h, add_a = np.unravel_index(np.argmax(matrix), matrix.shape)
 
         # Derive outcomes
         probs = {}
@@ -199,7 +252,7 @@ class PoissonModel:
         probs["base_home_xg"] = round(base_home_xg, 2)
         probs["base_away_xg"] = round(base_away_xg, 2)
 
-        return probs
+        return probs, home_score + int(add_h), away_score + int(add_a)
 
     def _final_probabilities(self, home_score: int, away_score: int) -> Dict[str, float]:
         """Return near-certain probabilities for end-of-game."""
@@ -223,17 +276,21 @@ class PoissonModel:
         home_score: int = 0, away_score: int = 0, minute: int = 0
     ) -> Tuple[int, int]:
         """Return the single most probable final score."""
-        base_h, base_a = self.get_expected_goals(home_team, away_team)
-        h_xg, a_xg = self.adjust_for_live(base_h, base_a, home_score, away_score, minute)
-        
-        best_p = 0
-        best_score = (home_score, away_score)
-        
-        for add_h in range(6):
-            for add_a in range(6):
-                p = poisson.pmf(add_h, max(h_xg, 0.01)) * poisson.pmf(add_a, max(a_xg, 0.01))
-                if p > best_p:
-                    best_p = p
-                    best_score = (home_score + add_h, away_score + add_a)
-        
-        return best_score
+        _, predicted_h, predicted_a = self.predict(
+            home_team, away_team, home_score, away_score, minute
+        )
+        return predicted_h, predicted_a
+
+
+def batch_probabilities(
+    games: List[Tuple[str, str, int, int, int]], team_ratings: Dict[str, Dict]
+) -> List[Tuple[Dict[str, float], int, int]]:
+    """
+    (probabilities, predicted_home, predicted_away) for a batch of games.
+    Each game is (home_team, away_team, home_score, away_score, minute).
+
+    Top-level and pure so it can run in a worker process.
+    """
+    model = PoissonModel()
+    model.update_team_ratings(team_ratings)
+    return [model.predict(*game) for game in games]
@@ -13,7 +13,11 @@ import asyncio
 import json
 import logging
 import os
-from typing import Dict, Optional
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import asynccontextmanager
+from typing import Dict, Iterable, Optional, Set
 import config
 
 logger = logging.getLogger(__name__)
@@ -21,6 +25,55 @@ logger = logging.getLogger(__name__)
 CACHE_FILE = "data/team_stats.json"
 
 
+class TeamRatingsCache(MutableMapping):
+    """
+    Team ratings keyed by lower-cased team name (so aliases differing only
+    in case share one entry).
+    
+    - Bounded to `maxsize` teams; the least recently refreshed are evicted.
+    - expire() drops entries not refreshed within `ttl` seconds. It is only
+      called after a successful refresh, so failed refreshes keep serving
+      the last known ratings.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()  # name -> (stored_at, rating)
+        self.version = 0  # Bumped on every write, so readers can skip unchanged snapshots
+
+    def __getitem__(self, team_name: str) -> dict:
+        return self._data[team_name.lower()][1]
+
+    def __setitem__(self, team_name: str, rating: dict):
+        key = team_name.lower()
+        self._data[key] = (time.monotonic(), rating)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        self.version += 1
+
+    def __delitem__(self, team_name: str):
+        del self._data[team_name.lower()]
+        self.version += 1
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def expire(self) -> int:
+        """Drop entries older than the TTL. Returns the number removed."""
+        cutoff = time.monotonic() - self.ttl
+        stale = [k for k, (stored_at, _) in self._data.items() if stored_at < cutoff]
+        for k in stale:
+            del self._data[k]
+        if stale:
+            self.version += 1
+        return len(stale)
+
+
 class StatsFetcher:
     """
     Fetches and caches team attack/defense ratings.
@@ -42,10 +95,19 @@ class StatsFetcher:
         "Champions League": "CL",
     }
 
+    # Refreshed when no live games tell us which leagues matter (cold start)
+    CORE_LEAGUES = ("PL", "PD", "BL1", "SA", "FL1")
+
     def __init__(self):
         self.api_key = config.FOOTBALL_DATA_API_KEY
         self.base_url = "https://api.football-data.org/v4"
-        self._cache: Dict[str, dict] = {}
+        self._cache = TeamRatingsCache(
+            maxsize=config.STATS_CACHE_MAX_TEAMS, ttl=config.STATS_CACHE_TTL
+        )
+        self.is_stale = False  # True when the last refresh failed and cached ratings are served
+        self.http: Optional[aiohttp.ClientSession] = None  # Shared session injected by the agent
+        self._etags: Dict[str, str] = {}                       # league code -> standings ETag
+        self._league_ratings: Dict[str, Dict[str, dict]] = {}  # league code -> last ratings
         self._load_cache()
 
     def _load_cache(self):
@@ -53,21 +115,30 @@ class StatsFetcher:
         try:
             if os.path.exists(CACHE_FILE):
                 with open(CACHE_FILE, "r") as f:
-                    self._cache = json.load(f)
+                    self._cache.update(json.load(f))
                 logger.info(f"Loaded {len(self._cache)} cached team records")
         except Exception as e:
             logger.warning(f"Could not load cache: {e}")
-            self._cache = {}
+            self._cache.clear()
 
     def _save_cache(self):
         """Save stats to disk cache."""
         try:
             os.makedirs("data", exist_ok=True)
             with open(CACHE_FILE, "w") as f:
-                json.dump(self._cache, f, indent=2)
+                json.dump(dict(self._cache), f, indent=2)
         except Exception as e:
             logger.warning(f"Cache save failed: {e}")
 
+    @asynccontextmanager
+    async def _session(self):
+        """Yield the shared session, or a temporary one if none was injected."""
+        if self.http and not self.http.closed:
+            yield self.http
+        else:
+            async with aiohttp.ClientSession() as session:
+                yield session
+
     async def fetch_league_teams(self, league_code: str = "PL") -> Dict[str, dict]:
         """
         Fetch team stats for a league.
@@ -78,22 +149,37 @@ class StatsFetcher:
             headers["X-Auth-Token"] = self.api_key
 
         url = f"{self.base_url}/competitions/{league_code}/standings"
+        if league_code in self._etags:
+            headers["If-None-Match"] = self._etags[league_code]
 
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._session() as session:
                 async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as resp:
                     if resp.status == 200:
                         data = await resp.json()
                         ratings = self._compute_ratings(data)
+                        if resp.headers.get("ETag"):
+                            self._etags[league_code] = resp.headers["ETag"]
+                        self._league_ratings[league_code] = ratings
                         self._cache.update(ratings)
                         self._save_cache()
                         return ratings
+                    elif resp.status == 304:
+                        # Standings unchanged: re-stamp the known ratings so they don't expire
+                        ratings = self._league_ratings.get(league_code, {})
+                        self._cache.update(ratings)
+                        return ratings
                     elif resp.status == 403:
                         logger.warning("API key invalid or not set - using default ratings")
                     elif resp.status == 429:
                         logger.warning("API rate limit hit - using cached data")
+                    self.is_stale = True
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Stats fetch error (serving cached ratings): {e}")
+            self.is_stale = True
         except Exception as e:
             logger.warning(f"Stats fetch error: {e}")
+            self.is_stale = True
 
         return self._cache
 
@@ -152,13 +238,36 @@ class StatsFetcher:
         logger.info(f"Computed ratings for {len(ratings)} teams")
         return ratings
 
+    def league_codes(self, league_names: Iterable[str]) -> Set[str]:
+        """
+        Map live-feed league names (e.g. "England. Premier League") to
+        supported football-data.org competition codes.
+        """
+        codes = set()
+        for name in league_names:
+            name_lower = name.lower()
+            for league, code in self.SUPPORTED_LEAGUES.items():
+                if league.lower() in name_lower:
+                    codes.add(code)
+        return codes
+
     async def fetch_all_leagues(self):
-        """Fetch stats for all major leagues."""
-        tasks = [
-            self.fetch_league_teams(code)
-            for code in list(self.SUPPORTED_LEAGUES.values())[:5]  # Limit API calls
-        ]
+        """Fetch stats for the core leagues."""
+        await self.fetch_leagues(self.CORE_LEAGUES)
+
+    async def fetch_leagues(self, league_codes: Iterable[str]):
+        """
+        Fetch stats for the given league codes.
+        Expired ratings are only dropped when every league refreshed;
+        otherwise the stale cache keeps being served.
+        """
+        self.is_stale = False
+        tasks = [self.fetch_league_teams(code) for code in league_codes]
         await asyncio.gather(*tasks, return_exceptions=True)
+        if not self.is_stale:
+            expired = self._cache.expire()
+            if expired:
+                logger.info(f"Expired {expired} stale team ratings")
         logger.info(f"Total cached teams: {len(self._cache)}")
 
     def get_team_rating(self, team_name: str) -> dict:
@@ -133,7 +133,7 @@ class AutoBettor:
             return False
 
     def _block(self, rec: BetRecommendation, reason: str):
-        logger.debug(f"Bet blocked: {reason}")
+        logger.debug("Bet blocked: %s", reason)
         if self.on_bet_blocked:
             self.on_bet_blocked(rec, reason)
 
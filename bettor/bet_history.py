@@ -4,6 +4,7 @@ Tracks all bets in SQLite for performance analysis.
 Calculates ROI, win rate, P&L, and alerts on daily loss limit.
 """
 
+import functools
 import sqlite3
 import logging
 from datetime import datetime, date
@@ -23,6 +24,12 @@ class BetHistory:
         self.db_path = db_path
         self._init_db()
 
+        # Read caches keyed by a write generation: every write bumps _gen, so
+        # stale entries never match again (and age out of the LRU)
+        self._gen = 0
+        self._cached_stats = functools.lru_cache(maxsize=8)(self._query_stats)
+        self._cached_recent_bets = functools.lru_cache(maxsize=8)(self._query_recent_bets)
+
     def _init_db(self):
         """Create tables if they don't exist."""
         import os
@@ -103,6 +110,7 @@ class BetHistory:
                 bet_type, bet_label, odds, stake, confidence,
                 model_probability, edge, int(auto_placed)
             ))
+            self._gen += 1
             return cursor.lastrowid
 
     def update_result(self, bet_id: int, status: str, final_score: str = "", pnl: float = None):
@@ -111,6 +119,7 @@ class BetHistory:
             conn.execute("""
                 UPDATE bets SET status=?, final_score=?, pnl=? WHERE id=?
             """, (status, final_score, pnl, bet_id))
+        self._gen += 1
 
     def get_today_loss(self) -> float:
         """Total losses today (for daily limit check)."""
@@ -138,7 +147,13 @@ class BetHistory:
         return self.get_today_loss() >= config.DAILY_LOSS_LIMIT
 
     def get_stats(self, days: int = 30) -> Dict:
-        """Get performance stats for last N days."""
+        """
+        Get performance stats for last N days.
+        Cached until the next write (or day change); treat the result as read-only.
+        """
+        return self._cached_stats(self._gen, date.today(), days)
+
+    def _query_stats(self, gen: int, today: date, days: int) -> Dict:
         with self._conn() as conn:
             rows = conn.execute("""
                 SELECT
@@ -177,7 +192,13 @@ class BetHistory:
         }
 
     def get_recent_bets(self, limit: int = 50) -> List[Dict]:
-        """Get most recent bets for display."""
+        """
+        Get most recent bets for display.
+        Cached until the next write; treat the result as read-only.
+        """
+        return self._cached_recent_bets(self._gen, limit)
+
+    def _query_recent_bets(self, gen: int, limit: int) -> List[Dict]:
         with self._conn() as conn:
             rows = conn.execute("""
                 SELECT id, timestamp, site, home_team, away_team,
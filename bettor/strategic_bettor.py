@@ -145,23 +145,23 @@ class StrategicBettor:
         
         # Strategy filters
         if confidence < self.settings.min_confidence:
-            logger.debug(f"Rejected: confidence {confidence} < {self.settings.min_confidence}")
+            logger.debug("Rejected: confidence %s < %s", confidence, self.settings.min_confidence)
             return None
         
         if edge < self.settings.min_edge:
-            logger.debug(f"Rejected: edge {edge:.2%} < {self.settings.min_edge:.2%}")
+            logger.debug("Rejected: edge %.2f%% < %.2f%%", edge * 100, self.settings.min_edge * 100)
             return None
         
         if odds < self.settings.min_odds or odds > self.settings.max_odds:
-            logger.debug(f"Rejected: odds {odds} outside range")
+            logger.debug("Rejected: odds %s outside range", odds)
             return None
         
         if minute < self.settings.min_minute:
-            logger.debug(f"Rejected: minute {minute} < {self.settings.min_minute}")
+            logger.debug("Rejected: minute %s < %s", minute, self.settings.min_minute)
             return None
         
         if minute > self.settings.max_minute:
-            logger.debug(f"Rejected: minute {minute} > {self.settings.max_minute}")
+            logger.debug("Rejected: minute %s > %s", minute, self.settings.max_minute)
             return None
         
         # Check daily bet limit
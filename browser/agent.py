@@ -4,11 +4,13 @@ Browser Agent - Connects to existing 1xbet browser via Playwright CDP
 """
 
 import asyncio
+import hashlib
 import logging
 import json
 from typing import Optional, List, Dict, Any, Callable
 from dataclasses import dataclass, field
 from datetime import datetime
+from scraper.xbet_markets import MARKET_1X2, MARKET_TOTALS, MARKET_BTTS, OUTCOME_TOTAL_OVER
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +21,22 @@ except ImportError:
     PLAYWRIGHT_AVAILABLE = False
     logger.error("Playwright not installed. Run: pip install playwright")
 
+# A DOM game row's team, score and time texts (null = element missing)
+_DOM_ROW_TEXTS_JS = """
+el => {
+    const text = sel => {
+        const found = el.querySelector(sel);
+        return found ? found.innerText : null;
+    };
+    return {
+        home: text(".team-name:first-child, [class*='home']"),
+        away: text(".team-name:last-child, [class*='away']"),
+        score: text(".score, [class*='score']"),
+        time: text(".time, [class*='time']"),
+    };
+}
+"""
+
 
 @dataclass
 class GameEvent:
@@ -361,19 +379,19 @@ class BrowserAgent:
                         market_type = market.get("T", 0)
                         outcomes = market.get("E", [])
                         
-                        if market_type == 1 and len(outcomes) >= 3:  # 1X2
+                        if market_type == MARKET_1X2 and len(outcomes) >= 3:
                             odds["home_win"] = float(outcomes[0].get("C", 0))
                             odds["draw"] = float(outcomes[1].get("C", 0))
                             odds["away_win"] = float(outcomes[2].get("C", 0))
-                        elif market_type == 17:  # Total
+                        elif market_type == MARKET_TOTALS:
                             for o in outcomes:
                                 name = str(o.get("N", "")).lower()
                                 if "2.5" in name:
-                                    if "over" in name or o.get("T") == 1:
+                                    if "over" in name or o.get("T") == OUTCOME_TOTAL_OVER:
                                         odds["over_25"] = float(o.get("C", 0))
                                     else:
                                         odds["under_25"] = float(o.get("C", 0))
-                        elif market_type == 40:  # BTTS
+                        elif market_type == MARKET_BTTS:
                             for o in outcomes:
                                 name = str(o.get("N", "")).lower()
                                 if "yes" in name:
@@ -393,7 +411,7 @@ class BrowserAgent:
                     games.append(game)
                     
                 except Exception as e:
-                    logger.debug(f"Event parse error: {e}")
+                    logger.debug("Event parse error: %s", e)
                     continue
         
         except Exception as e:
@@ -434,42 +452,41 @@ class BrowserAgent:
             
             for el in game_elements[:30]:  # Limit to 30 games
                 try:
-                    # Extract team names
-                    home_el = await el.query_selector(".team-name:first-child, [class*='home']")
-                    away_el = await el.query_selector(".team-name:last-child, [class*='away']")
+                    # Team names, score and time in one round trip
+                    info = await el.evaluate(_DOM_ROW_TEXTS_JS)
                     
-                    if not home_el or not away_el:
+                    if info["home"] is None or info["away"] is None:
                         continue
                     
-                    home = (await home_el.inner_text()).strip()
-                    away = (await away_el.inner_text()).strip()
+                    home = info["home"].strip()
+                    away = info["away"].strip()
                     
                     if not home or not away:
                         continue
                     
                     # Score
-                    score_el = await el.query_selector(".score, [class*='score']")
-                    score_text = (await score_el.inner_text()).strip() if score_el else "0:0"
+                    score_text = info["score"].strip() if info["score"] is not None else "0:0"
                     parts = score_text.replace("-", ":").split(":")
                     home_score = int(parts[0]) if parts else 0
                     away_score = int(parts[1]) if len(parts) > 1 else 0
                     
                     # Time
-                    time_el = await el.query_selector(".time, [class*='time']")
                     minute = 0
-                    if time_el:
-                        time_text = (await time_el.inner_text()).strip()
+                    if info["time"] is not None:
+                        time_text = info["time"].strip()
                         import re
                         minute = int(re.sub(r"\D", "", time_text)) if time_text else 0
                     
                     # Odds (first few)
-                    odds_els = await el.query_selector_all(".odd, [class*='odd']")
+                    # All odds texts in one round trip instead of one per button
+                    odds_texts = await el.eval_on_selector_all(
+                        ".odd, [class*='odd']", "els => els.slice(0, 6).map(e => e.innerText)"
+                    )
                     odds = {}
                     odds_vals = []
-                    for oe in odds_els[:6]:
+                    for txt in odds_texts:
                         try:
-                            txt = (await oe.inner_text()).strip()
-                            val = float(txt)
+                            val = float(txt.strip())
                             odds_vals.append(val)
                         except:
                             pass
@@ -482,8 +499,10 @@ class BrowserAgent:
                         odds["over_25"] = odds_vals[3]
                         odds["under_25"] = odds_vals[4]
                     
+                    # blake2b, not hash(): ids must survive a restart
+                    digest = hashlib.blake2b(f"{home}|{away}".encode(), digest_size=8).hexdigest()
                     game = GameEvent(
-                        id=f"1xbet_dom_{hash(home + away)}",
+                        id=f"1xbet_dom_{digest}",
                         home_team=home,
                         away_team=away,
                         home_score=home_score,
@@ -494,7 +513,7 @@ class BrowserAgent:
                     games.append(game)
                     
                 except Exception as e:
-                    logger.debug(f"DOM element parse error: {e}")
+                    logger.debug("DOM element parse error: %s", e)
                     continue
         
         except Exception as e:
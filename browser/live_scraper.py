@@ -6,16 +6,17 @@ Direct API scraper for 1xbet - bypasses DOM for more reliable data
 import asyncio
 import logging
 import json
-import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
+from operator import attrgetter
 import aiohttp
+from scraper.xbet_markets import MARKET_1X2, MARKET_TOTALS, MARKET_BTTS, OUTCOME_TOTAL_OVER
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LiveGame:
     """Represents a live football game with odds"""
     game_id: str
@@ -38,6 +39,14 @@ class LiveGame:
     timestamp: datetime = field(default_factory=datetime.now)
 
 
+# What _update_cache compares between polls: everything the analyzer reads
+_CACHE_KEY_FIELDS = attrgetter(
+    "game_id", "minute", "home_score", "away_score",
+    "odds_home_win", "odds_draw", "odds_away_win",
+    "odds_over_25", "odds_under_25", "odds_btts_yes", "odds_btts_no",
+)
+
+
 class LiveScraper:
     """
     Direct API scraper for 1xbet live games.
@@ -54,35 +63,51 @@ class LiveScraper:
         "https://1xbet.com/api/v1/live/events",
     ]
     
-    def __init__(self, browser_agent=None, odds_api_key: str = None):
+    # The Odds API bookmaker keys for 1xbet ("onexbet" is the documented key)
+    ODDS_API_BOOKMAKER_KEYS = ("onexbet", "1xbet")
+
+    # Sent per request so they apply on a shared session too
+    REQUEST_HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+        "Accept": "application/json, text/html",
+        "Accept-Language": "en-US,en;q=0.9",
+    }
+    
+    def __init__(self, browser_agent=None, odds_api_key: str = None,
+                 http: Optional[aiohttp.ClientSession] = None):
         self.browser_agent = browser_agent
         self.odds_api_key = odds_api_key
+        self.http = http  # Shared session owned by the agent (never closed here)
         self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock = asyncio.Lock()
         self._last_fetch = None
         self._cache_ttl = 30  # seconds
-        self._cached_games: List[LiveGame] = []
+        self._cached_games: Tuple[LiveGame, ...] = ()
+        self._cache_key: Tuple = ()
     
     async def get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session"""
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession(
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                    "Accept": "application/json, text/html",
-                    "Accept-Language": "en-US,en;q=0.9",
-                }
-            )
-        return self._session
+        """Get the shared session, or create our own aiohttp session"""
+        if self.http and not self.http.closed:
+            return self.http
+        if self._session and not self._session.closed:
+            return self._session
+        
+        # Double-checked so concurrent first callers share one session
+        async with self._session_lock:
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession()
+            return self._session
     
     async def close(self):
-        """Close the session"""
+        """Close our own session (a shared one is closed by its owner)"""
         if self._session and not self._session.closed:
             await self._session.close()
     
-    async def get_live_games(self, force_refresh: bool = False) -> List[LiveGame]:
+    async def get_live_games(self, force_refresh: bool = False) -> Tuple[LiveGame, ...]:
         """
         Get live games using multiple strategies.
         Returns cached results if within TTL.
+        The result is an immutable tuple shared with the cache.
         """
         # Check cache
         if not force_refresh and self._cached_games:
@@ -98,8 +123,7 @@ class LiveScraper:
                 games = await self._get_via_browser()
                 if games:
                     logger.info(f"Got {len(games)} games via browser agent")
-                    self._update_cache(games)
-                    return games
+                    return self._update_cache(games)
             except Exception as e:
                 logger.warning(f"Browser agent failed: {e}")
         
@@ -107,23 +131,21 @@ class LiveScraper:
         games = await self._get_via_direct_api()
         if games:
             logger.info(f"Got {len(games)} games via direct API")
-            self._update_cache(games)
-            return games
+            return self._update_cache(games)
         
         # Strategy 3: The Odds API backup
         if self.odds_api_key:
             games = await self._get_via_odds_api()
             if games:
                 logger.info(f"Got {len(games)} games via Odds API")
-                self._update_cache(games)
-                return games
+                return self._update_cache(games)
         
         # Return cached if all strategies fail
         if self._cached_games:
             logger.warning("Using stale cache - all sources failed")
             return self._cached_games
         
-        return []
+        return ()
     
     async def _get_via_browser(self) -> List[LiveGame]:
         """Get games using browser agent"""
@@ -180,7 +202,8 @@ class LiveScraper:
                     "getMulti": "1",
                 }
                 
-                async with session.get(endpoint, params=params, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                async with session.get(endpoint, params=params, headers=self.REQUEST_HEADERS,
+                                       timeout=aiohttp.ClientTimeout(total=10)) as resp:
                     if resp.status == 200:
                         data = await resp.json()
                         games = self._parse_1xbet_response(data)
@@ -252,7 +275,7 @@ class LiveScraper:
                     games.append(game)
                     
                 except Exception as e:
-                    logger.debug(f"Event parse error: {e}")
+                    logger.debug("Event parse error: %s", e)
                     continue
         
         except Exception as e:
@@ -270,24 +293,24 @@ class LiveScraper:
                 outcomes = market.get("E", [])
                 
                 # 1X2 (match result)
-                if market_type == 1 and len(outcomes) >= 3:
+                if market_type == MARKET_1X2 and len(outcomes) >= 3:
                     odds["home_win"] = float(outcomes[0].get("C", 0)) or None
                     odds["draw"] = float(outcomes[1].get("C", 0)) or None
                     odds["away_win"] = float(outcomes[2].get("C", 0)) or None
                 
-                # Total goals
-                elif market_type == 17:
+                # Total goals - the line is in "P" when sent (number or string), else only in the name
+                elif market_type == MARKET_TOTALS:
                     for o in outcomes:
                         name = str(o.get("N", "")).lower()
-                        if "2.5" in name:
-                            outcome_type = o.get("T", 0)
-                            if outcome_type == 1 or "over" in name:
-                                odds["over_25"] = float(o.get("C", 0)) or None
-                            else:
-                                odds["under_25"] = float(o.get("C", 0)) or None
+                        if str(o.get("P")) != "2.5" and "2.5" not in name:
+                            continue
+                        if o.get("T") == OUTCOME_TOTAL_OVER or "over" in name:
+                            odds["over_25"] = float(o.get("C", 0)) or None
+                        else:
+                            odds["under_25"] = float(o.get("C", 0)) or None
                 
                 # BTTS
-                elif market_type == 40:
+                elif market_type == MARKET_BTTS:
                     for o in outcomes:
                         name = str(o.get("N", "")).lower()
                         if "yes" in name:
@@ -321,20 +344,22 @@ class LiveScraper:
                 "live": "true"
             }
             
-            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+            async with session.get(url, params=params, headers=self.REQUEST_HEADERS,
+                                   timeout=aiohttp.ClientTimeout(total=10)) as resp:
                 if resp.status == 200:
                     data = await resp.json()
                     logger.info(f"Odds API returned {len(data)} games")
                     
                     for event in data:
-                        # Use first available bookmaker (not just 1xbet)
+                        # Prefer 1xbet odds, fall back to the first bookmaker listed
                         bookmakers = event.get("bookmakers", [])
-                        if not bookmakers:
+                        bookmaker = next(
+                            (b for b in bookmakers if b.get("key") in self.ODDS_API_BOOKMAKER_KEYS),
+                            bookmakers[0] if bookmakers else None
+                        )
+                        if bookmaker is None:
                             continue
                         
-                        # Use the first bookmaker with odds
-                        bookmaker = bookmakers[0]
-                        
                         home = event.get("home_team", "Unknown")
                         away = event.get("away_team", "Unknown")
                         
@@ -354,8 +379,10 @@ class LiveScraper:
                         
                         # Extract odds
                         odds = {}
+                        seen_markets = set()
                         for outcome in bookmaker.get("markets", []):
-                            if outcome.get("key") == "h2h":
+                            key = outcome.get("key")
+                            if key == "h2h":
                                 for o in outcome.get("outcomes", []):
                                     name = o.get("name", "").lower()
                                     if home.lower() in name:
@@ -365,13 +392,19 @@ class LiveScraper:
                                     elif "draw" in name:
                                         odds["draw"] = o.get("price")
                             
-                            elif outcome.get("key") == "totals":
+                            elif key == "totals":
                                 for o in outcome.get("outcomes", []):
                                     name = o.get("name", "").lower()
                                     if "over" in name:
                                         odds["over_25"] = o.get("price")
                                     elif "under" in name:
                                         odds["under_25"] = o.get("price")
+                            else:
+                                continue
+                            
+                            seen_markets.add(key)
+                            if len(seen_markets) == 2:
+                                break
                         
                         game = LiveGame(
                             game_id=f"oddsapi_{event.get('id', '')}",
@@ -398,11 +431,20 @@ class LiveScraper:
         
         return games
     
-    def _update_cache(self, games: List[LiveGame]):
-        """Update the game cache"""
+    def _update_cache(self, games: List[LiveGame]) -> Tuple[LiveGame, ...]:
+        """
+        Update the game cache.
+        Keeps the previous tuple (and its LiveGame objects) when the feed
+        content is unchanged, so stable polls allocate nothing new.
+        """
         import time
-        self._cached_games = games
+        # Exact key (compared with ==): any score, minute or odds change counts
+        key = tuple(_CACHE_KEY_FIELDS(g) for g in games)
+        if not self._cached_games or key != self._cache_key:
+            self._cached_games = tuple(games)
+            self._cache_key = key
         self._last_fetch = time.time()
+        return self._cached_games
     
     async def refresh(self):
         """Force refresh the game cache"""
@@ -412,9 +454,12 @@ class LiveScraper:
 # Singleton
 _live_scraper: Optional[LiveScraper] = None
 
-def get_live_scraper(browser_agent=None, odds_api_key: str = None) -> LiveScraper:
+def get_live_scraper(browser_agent=None, odds_api_key: str = None,
+                     http: Optional[aiohttp.ClientSession] = None) -> LiveScraper:
     """Get the global live scraper instance"""
     global _live_scraper
     if _live_scraper is None:
-        _live_scraper = LiveScraper(browser_agent, odds_api_key)
+        _live_scraper = LiveScraper(browser_agent, odds_api_key, http)
+    elif http is not None:
+        _live_scraper.http = http
     return _live_scraper
@@ -4,10 +4,13 @@ Detects and manages the 1xbet browser window using pywinctl/win32gui
 """
 
 import logging
+import os
 import time
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
 
+import config
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -25,6 +28,9 @@ try:
 except ImportError:
     WIN32_AVAILABLE = False
 
+# Lower-cased ASCII needle for the EnumWindows hot path
+_XBET_BYTES = b"1xbet"
+
 
 @dataclass
 class BrowserWindow:
@@ -52,6 +58,7 @@ class WindowManager:
         self._cached_window: Optional[BrowserWindow] = None
         self._last_scan_time = 0
         self._scan_cache_ttl = 5  # seconds
+        self._debug_port_cache: Dict[int, str] = {}  # pid -> "host:port"
     
     def find_1xbet_window(self, force_refresh: bool = False) -> Optional[BrowserWindow]:
         """
@@ -122,34 +129,41 @@ class WindowManager:
     def _find_with_win32gui(self) -> Optional[BrowserWindow]:
         """Find window using win32gui (fallback)"""
         try:
-            result = {"window": None}
+            candidates: List[int] = []
             
-            def enum_callback(hwnd, windows):
-                if win32gui.IsWindowVisible(hwnd):
-                    title = win32gui.GetWindowText(hwnd)
-                    if any(term in title.lower() for term in self.XBET_TERMS):
-                        # Get process ID
-                        _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                        
-                        # Get process name
-                        try:
-                            proc = psutil.Process(pid)
-                            proc_name = proc.name().lower()
-                        except:
-                            proc_name = "unknown"
-                        
-                        result["window"] = BrowserWindow(
-                            hwnd=hwnd,
-                            title=title,
-                            process_name=proc_name,
-                            pid=pid,
-                            is_active=True
-                        )
-                        return False  # Stop enumeration
+            def enum_callback(hwnd, _):
+                # Runs once per top-level window - keep it to a cheap title test
+                if not win32gui.IsWindowVisible(hwnd):
+                    return True
+                title = win32gui.GetWindowText(hwnd)
+                if not title or len(title) < 5:
+                    return True
+                if _XBET_BYTES in title.encode("ascii", "ignore").lower():
+                    candidates.append(hwnd)
                 return True
             
             win32gui.EnumWindows(enum_callback, None)
-            return result["window"]
+            
+            # Process lookups only for the windows that matched
+            for hwnd in candidates:
+                title = win32gui.GetWindowText(hwnd)
+                _, pid = win32process.GetWindowThreadProcessId(hwnd)
+                
+                # Get process name
+                try:
+                    proc = psutil.Process(pid)
+                    proc_name = proc.name().lower()
+                except:
+                    proc_name = "unknown"
+                
+                return BrowserWindow(
+                    hwnd=hwnd,
+                    title=title,
+                    process_name=proc_name,
+                    pid=pid,
+                    is_active=True
+                )
+            return None
         except Exception as e:
             logger.error(f"win32gui search error: {e}")
             return None
@@ -216,33 +230,41 @@ class WindowManager:
         """
         Get Chrome DevTools Protocol port for the browser window.
         This allows connecting via Playwright CDP.
+        
+        Resolution order: per-pid cache, CHROME_DEBUG_PORT env var, the window's
+        own --remote-debugging-port, then config.CHROME_DEBUG_PORT.
         """
+        cached = self._debug_port_cache.get(window.pid)
+        if cached:
+            return cached
+        
+        port = os.environ.get("CHROME_DEBUG_PORT")
+        if port:
+            address = f"localhost:{port}"
+        else:
+            address = (self._probe_debug_port(window)
+                       or f"localhost:{getattr(config, 'CHROME_DEBUG_PORT', 9222)}")
+        
+        self._debug_port_cache[window.pid] = address
+        return address
+    
+    def _probe_debug_port(self, window: BrowserWindow) -> Optional[str]:
+        """Read --remote-debugging-port from the browser command line (slow on Windows)"""
+        # Only Chromium-based browsers accept --remote-debugging-port
+        if not any(b in window.process_name for b in ("chrome", "msedge", "brave", "opera")):
+            return None
+        
         try:
-            # Chrome remote debugging port is usually 9222
-            # For existing window, we need to find the actual port
-            # This is typically stored in the environment or can be discovered
-            
-            # Common approach: check if chrome was started with --remote-debugging-port
-            # We'll try to connect to common ports
             proc = psutil.Process(window.pid)
-            
-            # Get command line to check for debugging port
-            try:
-                cmdline = proc.cmdline()
-                for arg in cmdline:
-                    if "--remote-debugging-port=" in arg:
-                        port = arg.split("=")[1]
-                        logger.info(f"Found Chrome debug port: {port}")
-                        return f"localhost:{port}"
-            except:
-                pass
-            
-            # Default port fallback
-            return "localhost:9222"
-            
+            for arg in proc.cmdline():
+                if "--remote-debugging-port=" in arg:
+                    port = arg.split("=")[1]
+                    logger.info(f"Found Chrome debug port: {port}")
+                    return f"localhost:{port}"
         except Exception as e:
             logger.debug(f"Could not get debug port: {e}")
-            return "localhost:9222"
+        
+        return None
     
     def list_all_browsers(self) -> List[Dict[str, Any]]:
         """List all browser windows (useful for debugging)"""
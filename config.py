@@ -2,6 +2,8 @@
 config.py - Central configuration for BetMaster Agent
 """
 
+import types
+
 # ===============================================
 # STRATEGY MODE
 # ===============================================
@@ -94,12 +96,16 @@ BROWSER_HEADLESS = False
 # CDP port for connecting to existing browser
 CHROME_DEBUG_PORT = 9222
 
+# Max site pages loading/scraping at once (sites served by direct API don't count)
+MAX_CONCURRENT_PAGES = 4
+
 # ===============================================
 # AI / OLLAMA SETTINGS
 # ===============================================
 OLLAMA_ENABLED = True
 OLLAMA_MODEL = "gemma3:1b"  # User confirmed this is running
 OLLAMA_URL = "http://localhost:11434"
+OLLAMA_CONCURRENCY = 2  # Max Ollama requests in flight at once
 
 # ===============================================
 # API KEYS
@@ -120,10 +126,18 @@ API_FOOTBALL_KEY = ""
 # Refresh interval for live data (seconds)
 REFRESH_INTERVAL = 60
 
+# Adaptive polling bounds (seconds): fast while games are in play, slow when none are live
+REFRESH_LIVE = 15
+REFRESH_IDLE = 300
+
 # Cache TTL for various data sources
 STATS_CACHE_TTL = 3600  # 1 hour
+STATS_CACHE_MAX_TEAMS = 5000  # Team ratings kept in memory (oldest refreshed evicted first)
 ODDS_CACHE_TTL = 30      # 30 seconds
 
+# Max seconds one site's scrape may take before the cycle moves on without it
+SITE_TIMEOUT_S = 25
+
 # ===============================================
 # BETTING SITES CREDENTIALS
 # ===============================================
@@ -148,6 +162,7 @@ DB_PATH = "data/bets.db"
 # ===============================================
 UI_THEME = "dark"
 UI_COLOR = "blue"
+UI_RENDER_DEBOUNCE_MS = 80  # Coalesce bursts of updates into one redraw
 
 # ===============================================
 # ANALYSIS WEIGHTS (must sum to 1.0)
@@ -159,6 +174,9 @@ ANALYSIS_WEIGHTS = {
     "head_to_head":  0.10,
     "home_advantage": 0.10,
 }
+# Checked once at import so a typo fails loudly instead of skewing every score
+if abs(sum(ANALYSIS_WEIGHTS.values()) - 1.0) > 1e-9:
+    raise ValueError(f"ANALYSIS_WEIGHTS must sum to 1.0 (got {sum(ANALYSIS_WEIGHTS.values())})")
 
 # ===============================================
 # REPORTING & NOTIFICATIONS
@@ -187,3 +205,14 @@ LOSS_COOLDOWN = 10
 LOG_LEVEL = "INFO"
 LOG_TO_FILE = True
 LOG_FILE = "logs/betmaster.log"
+
+# ===============================================
+# READ-ONLY VIEWS (keep at the end of this file)
+# ===============================================
+# Site settings are fixed after load; freezing them makes accidental
+# runtime mutation fail loudly instead of silently diverging from this file.
+ENABLED_SITES = tuple(ENABLED_SITES)
+SITE_URLS = types.MappingProxyType(SITE_URLS)
+SITE_CREDENTIALS = types.MappingProxyType(
+    {site: types.MappingProxyType(creds) for site, creds in SITE_CREDENTIALS.items()}
+)
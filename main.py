@@ -13,58 +13,122 @@ Run with: python main.py
 """
 
 import asyncio
+import atexit
+import collections
+import concurrent.futures
 import logging
-import threading
+import logging.handlers
+import multiprocessing
+import operator
+import queue
+import signal
 import time
 import sys
 import os
 
 os.makedirs("logs", exist_ok=True)
 
-# Configure logging with UTF-8 encoding
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    handlers=[
+# Fix for Windows console encoding (in place, before the log StreamHandler
+# captures sys.stdout)
+if sys.platform == 'win32':
+    for _stream in (sys.stdout, sys.stderr):
+        if hasattr(_stream, 'reconfigure'):
+            _stream.reconfigure(encoding='utf-8', errors='replace')
+
+# Configure logging with UTF-8 encoding.
+# Records are queued and written by a listener thread so console/file I/O
+# never blocks the asyncio loop.
+# Skipped in analysis worker processes, which re-import this module on
+# Windows and must not open the log file a second time.
+if multiprocessing.parent_process() is None:
+    _log_formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    _log_handlers = [
         logging.StreamHandler(sys.stdout),
-        logging.FileHandler("logs/betmaster.log", encoding="utf-8"),
+        logging.handlers.RotatingFileHandler(
+            "logs/betmaster.log", maxBytes=10_000_000, backupCount=5, encoding="utf-8"
+        ),
     ]
-)
-
-# Fix for Windows console encoding
-if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+    for _handler in _log_handlers:
+        _handler.setFormatter(_log_formatter)
+
+    _log_queue = queue.Queue(-1)
+    logging.basicConfig(
+        level=logging.INFO,
+        handlers=[logging.handlers.QueueHandler(_log_queue)],
+    )
+    _log_listener = logging.handlers.QueueListener(
+        _log_queue, *_log_handlers, respect_handler_level=True
+    )
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
 
 logger = logging.getLogger("main")
 
 import config
-from browser.window_manager import get_window_manager
-from browser.agent import get_browser_agent
-from browser.live_scraper import get_live_scraper
-from scraper.scraper_manager import ScraperManager
-from analyzer.stats_fetcher import StatsFetcher
-from analyzer.poisson_model import PoissonModel
-from analyzer.ollama_analyzer import get_ollama_analyzer
-from predictor.confidence_engine import ConfidenceEngine
-from bettor.bet_history import BetHistory
-from bettor.auto_bettor import AutoBettor
 from bettor.strategic_bettor import get_strategic_bettor, StrategyMode
-from ui.web_server import SoccerBotWebServer
+# Heavier component modules (playwright, aiohttp, numpy/scipy, ...) are imported
+# where they are first used, so the banner prints immediately and analysis
+# worker processes that re-import this module stay light.
+
+# config.STRATEGY_MODE / dashboard mode string -> StrategyMode
+_STRATEGY_MAP = {mode.value: mode for mode in StrategyMode}
+
+# record_bet() field -> attribute path on a BetRecommendation -> default.
+# Dict recommendations (from the web UI) are flattened, keyed by the last path segment.
+_BET_FIELDS = (
+    ("site", "game.site", "unknown"),
+    ("game_id", "game.game_id", ""),
+    ("home_team", "game.home_team", "Unknown"),
+    ("away_team", "game.away_team", "Unknown"),
+    ("home_score", "game.home_score", 0),
+    ("away_score", "game.away_score", 0),
+    ("minute", "game.minute", 0),
+    ("bet_type", "bet_type", ""),
+    ("bet_label", "bet_label", "Bet"),
+    ("odds", "odds", 1.0),
+    ("stake", "recommended_stake", 0),
+    ("confidence", "confidence", 0),
+    ("model_probability", "model_probability", 0),
+    ("edge", "edge", 0),
+)
+_ATTRGETTERS = {path: operator.attrgetter(path) for _, path, _ in _BET_FIELDS}
+_DICT_KEYS = {path: (path.rsplit(".", 1)[-1], default) for _, path, default in _BET_FIELDS}
+
+
+def _extract_bet_field(rec, path: str):
+    """Read one bet field from a dict or BetRecommendation."""
+    if isinstance(rec, dict):
+        key, default = _DICT_KEYS[path]
+        return rec.get(key, default)
+    return _ATTRGETTERS[path](rec)
 
 
 class BetMasterAgent:
     """
     Main application controller.
-    Runs analysis loop in background, Web UI on port 8080.
+    Runs the analysis loop and the Web UI (port 8080) on one asyncio event loop.
     """
 
+    AUTO_ON_LABEL = "🤖 AUTO-ON"
+    AUTO_OFF_LABEL = "👤 Auto-OFF"
+
     def __init__(self):
+        from browser.window_manager import get_window_manager
+        from browser.agent import get_browser_agent
+        from browser.live_scraper import get_live_scraper
+        from scraper.scraper_manager import ScraperManager
+        from analyzer.stats_fetcher import StatsFetcher
+        from predictor.confidence_engine import ConfidenceEngine
+        from bettor.bet_history import BetHistory
+        from ui.web_server import SoccerBotWebServer
+
         # Initialize components
         self.dashboard = SoccerBotWebServer(port=8080)
         self.history = BetHistory()
         self.engine = ConfidenceEngine()
+        # Worker processes for the per-game Poisson math (started on first use)
+        self._cpu_workers = max(1, (os.cpu_count() or 2) - 1)
+        self._cpu_pool = concurrent.futures.ProcessPoolExecutor(max_workers=self._cpu_workers)
         self.stats_fetcher = StatsFetcher()
         
         # Browser components
@@ -76,10 +140,9 @@ class BetMasterAgent:
         )
         
         # Strategic bettor
-        strategy = StrategyMode.CONSERVATIVE
-        if config.STRATEGY_MODE == "aggressive":
-            strategy = StrategyMode.AGGRESSIVE
-        self.strategic_bettor = get_strategic_bettor(strategy)
+        self._strategy = _STRATEGY_MAP.get(config.STRATEGY_MODE.lower(), StrategyMode.CONSERVATIVE)
+        self._strategy_label = config.STRATEGY_MODE.title()
+        self.strategic_bettor = get_strategic_bettor(self._strategy)
         
         # Legacy scraper manager (for SportPesa, etc.)
         self.scraper_manager = ScraperManager()
@@ -89,9 +152,17 @@ class BetMasterAgent:
         
         # State
         self._running = False
-        self._loop = None
-        self._analysis_thread = None
-        self._force_refresh = False
+        self._idle = False  # True only while waiting for the next cycle
+        self._main_task = None  # The _async_main task, cancelled to interrupt a cycle
+        self._http = None  # Shared aiohttp session, created on the event loop
+        self._refresh_event = asyncio.Event()
+        self._last_games = []
+        self._recent_leagues = collections.deque(maxlen=2)  # League codes seen in the last 2 cycles
+        self._league_tasks = set()  # In-flight stats fetches for newly seen leagues
+        self._last_total_recs = 0
+        self._last_refresh_trigger = 0.0
+        self._last_hashes = {"bets": None, "stats": None, "scraper": None, "strategy": None}
+        self._last_ratings_version = None
         
         # UI callbacks
         self.dashboard.on_manual_bet = self._handle_manual_bet
@@ -101,104 +172,135 @@ class BetMasterAgent:
         self.dashboard.on_strategy_change = self._handle_strategy_change
 
     def start(self):
-        """Start analysis loop in background, then launch server."""
+        """Run the analysis loop and web server on one asyncio event loop."""
         logger.info("🚀 Starting BetMaster Agent...")
         self._running = True
 
-        # Start background analysis loop
-        self._analysis_thread = threading.Thread(
-            target=self._run_async_loop, daemon=True
-        )
-        self._analysis_thread.start()
-
         print("🌐 DASHBOARD: http://localhost:8080")
         print(f"📊 Strategy: {config.STRATEGY_MODE}")
         print(f"🤖 Ollama: {config.OLLAMA_MODEL}")
-        
+
         try:
-            while self._running:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            self._running = False
-            
+            asyncio.run(self._async_main())
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            pass
+
         logger.info("👋 BetMaster shutting down...")
 
-    def _run_async_loop(self):
-        """Run the async scraping + analysis loop in background thread."""
-        self._loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self._loop)
+    def _install_signal_handlers(self):
+        """Stop the main loop cleanly on Ctrl+C."""
+        loop = asyncio.get_running_loop()
         try:
-            self._loop.run_until_complete(self._async_main())
-        except Exception as e:
-            logger.error(f"Async loop error: {e}")
-        finally:
-            self._loop.close()
+            loop.add_signal_handler(signal.SIGINT, self._request_shutdown)
+        except NotImplementedError:
+            # Windows event loops don't support add_signal_handler
+            signal.signal(
+                signal.SIGINT,
+                lambda signum, frame: loop.call_soon_threadsafe(self._request_shutdown),
+            )
+
+    def _request_shutdown(self):
+        """
+        Stop on Ctrl+C: between cycles, just leave the main loop; mid-cycle, or on
+        a second Ctrl+C, cancel the main task (its cleanup still runs).
+        """
+        graceful = self._running and self._idle
+        self._running = False
+        self._refresh_event.set()
+        if not graceful and self._main_task:
+            self._main_task.cancel()
 
     async def _async_main(self):
         """Main async loop: scrape → analyze → bet → repeat."""
+        import aiohttp
+
+        self._main_task = asyncio.current_task()
+        self._install_signal_handlers()
+
+        # One keepalive connection pool shared by every HTTP client
+        self._http = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=32, limit_per_host=8, keepalive_timeout=75, ttl_dns_cache=300
+            )
+        )
+        self.stats_fetcher.http = self._http
+        self.live_scraper.http = self._http
+        self.engine.ollama.http = self._http
+        self.scraper_manager.http = self._http
         
-        # Initialize browser agent
-        self.dashboard.update_status("● Connecting to browser...")
-        
+        stats_task = None
         try:
-            # Connect to existing browser or launch new
-            browser_connected = await self.browser_agent.connect(
-                use_existing=config.BROWSER_CONNECT_TO_EXISTING,
-                headless=config.BROWSER_HEADLESS
-            )
+            # Initialize browser agent
+            self.dashboard.update_status("● Connecting to browser...")
+        
+            try:
+                # Connect to existing browser or launch new
+                browser_connected = await self.browser_agent.connect(
+                    use_existing=config.BROWSER_CONNECT_TO_EXISTING,
+                    headless=config.BROWSER_HEADLESS
+                )
             
-            if browser_connected:
-                logger.info(f"Browser connected via: {self.browser_agent.connection_method}")
-                self.dashboard.update_status("● Browser connected")
+                if browser_connected:
+                    logger.info(f"Browser connected via: {self.browser_agent.connection_method}")
+                    self.dashboard.update_status("● Browser connected")
                 
-                # Navigate to 1xbet if not already there
-                if self.browser_agent.page:
-                    current_url = self.browser_agent.current_url
-                    if not current_url or "1xbet" not in current_url.lower():
-                        await self.browser_agent.navigate_to_1xbet()
-            else:
-                logger.warning("Could not connect to browser, using API fallback")
-                self.dashboard.update_status("⚠️ Browser not connected, using API fallback")
+                    # Navigate to 1xbet if not already there
+                    if self.browser_agent.page:
+                        current_url = self.browser_agent.current_url
+                        if not current_url or "1xbet" not in current_url.lower():
+                            await self.browser_agent.navigate_to_1xbet()
+                else:
+                    logger.warning("Could not connect to browser, using API fallback")
+                    self.dashboard.update_status("⚠️ Browser not connected, using API fallback")
                 
-        except Exception as e:
-            logger.error(f"Browser connection failed: {e}")
-            self.dashboard.update_status(f"⚠️ Browser error: {str(e)[:50]}")
+            except Exception as e:
+                logger.error(f"Browser connection failed: {e}")
+                self.dashboard.update_status(f"⚠️ Browser error: {str(e)[:50]}")
 
-        # Initialize web server
-        await self.dashboard.start()
+            # Initialize web server
+            await self.dashboard.start()
         
-        # Initialize auto-bettor
-        self.auto_bettor = AutoBettor(self.scraper_manager, self.history)
-        self.auto_bettor.on_bet_placed = self._on_bet_placed
-        self.auto_bettor.on_bet_blocked = self._on_bet_blocked
+            # Initialize auto-bettor
+            from bettor.auto_bettor import AutoBettor
+            self.auto_bettor = AutoBettor(self.scraper_manager, self.history)
+            self.auto_bettor.on_bet_placed = self._on_bet_placed
+            self.auto_bettor.on_bet_blocked = self._on_bet_blocked
 
-        # Fetch initial stats in background
-        asyncio.create_task(self._fetch_stats_background())
+            # Fetch stats in background, refreshing every half TTL
+            stats_task = asyncio.create_task(self._stats_refresh_loop())
 
-        self.dashboard.update_status("● Running...")
-        logger.info("✅ BetMaster Agent ready!")
+            self.dashboard.update_status("● Running...")
+            logger.info("✅ BetMaster Agent ready!")
 
-        # Main loop
-        while self._running:
-            try:
-                await self._run_analysis_cycle()
-            except Exception as e:
-                logger.error(f"Analysis cycle error: {e}")
-                self.dashboard.update_status(f"⚠️ Error: {str(e)[:50]}")
-
-            # Wait for next refresh
-            self._force_refresh = False
-            for _ in range(config.REFRESH_INTERVAL):
-                if not self._running:
-                    break
-                if self._force_refresh:
-                    break
-                await asyncio.sleep(1)
-
-        # Cleanup
-        await self.browser_agent.disconnect()
-        await self.live_scraper.close()
-        await self.scraper_manager.stop()
+            # Main loop
+            while self._running:
+                try:
+                    await self._run_analysis_cycle()
+                except Exception as e:
+                    logger.error(f"Analysis cycle error: {e}")
+                    self.dashboard.update_status(f"⚠️ Error: {str(e)[:50]}")
+
+                # Wait for next refresh (or a manual refresh / shutdown, whichever comes first)
+                self._idle = True
+                try:
+                    await asyncio.wait_for(self._refresh_event.wait(), timeout=self._next_interval())
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    self._idle = False
+                    self._refresh_event.clear()
+        finally:
+            # Cleanup (also on cancellation or an unexpected error)
+            if stats_task:
+                stats_task.cancel()
+            for task in self._league_tasks:
+                task.cancel()
+            await self.dashboard.stop()
+            await self.browser_agent.disconnect()
+            await self.live_scraper.close()
+            await self._http.close()
+            await self.scraper_manager.stop()
+            self._cpu_pool.shutdown(wait=False, cancel_futures=True)
 
     async def _run_analysis_cycle(self):
         """One full cycle: scrape → analyze → update UI."""
@@ -208,57 +310,76 @@ class BetMasterAgent:
         # Step 1: Get live games (browser agent + API fallback)
         self.dashboard.update_status("● Fetching live games...")
         
-        # Try browser agent first
-        games = []
-        try:
-            if self.browser_agent.is_connected:
-                games = await self.live_scraper.get_live_games(force_refresh=True)
-        except Exception as e:
-            logger.warning(f"Browser scraper error: {e}")
+        # Query browser agent and legacy scrapers concurrently
+        sources = []
+        if self.browser_agent.is_connected:
+            sources.append(("Browser", self.live_scraper.get_live_games(force_refresh=True)))
+        sources.append(("Legacy", self.scraper_manager.get_all_live_games()))
         
-        # If no games, try legacy scraper
-        if not games:
-            try:
-                games = await self.scraper_manager.get_all_live_games()
-            except Exception as e:
-                logger.warning(f"Legacy scraper error: {e}")
+        results = await asyncio.gather(*[coro for _, coro in sources], return_exceptions=True)
+        
+        # Merge, keyed by teams + minute; browser results win (fresher odds)
+        merged = {}
+        for (name, _), result in zip(sources, results):
+            if isinstance(result, Exception):
+                logger.warning(f"{name} scraper error: {result}")
+                continue
+            for game in result or ():
+                merged.setdefault((game.home_team, game.away_team, game.minute), game)
+        games = list(merged.values())
         
+        self._last_games = games
+        self._track_leagues(games)
+        self._last_total_recs = 0
+
         if not games:
             self.dashboard.update_status("⚠️ No live games found")
             self.dashboard.update_games([])
             return
 
+        # Show the fresh game list right away; analysis can take a while (Ollama)
+        self.dashboard.update_batch(games=games)
         self.dashboard.update_status(f"● Analyzing {len(games)} games...")
-        self.dashboard.update_games(games)
 
-        # Step 2: Update Poisson model with team ratings
-        all_ratings = self.stats_fetcher._cache
-        if all_ratings:
-            self.engine.poisson.update_team_ratings(all_ratings)
+        # Step 2: Update Poisson model with team ratings (only when they changed)
+        ratings_cache = self.stats_fetcher._cache
+        if ratings_cache.version != self._last_ratings_version:
+            # Snapshot so a concurrent refresh/expiry can't change it mid-update
+            all_ratings = dict(ratings_cache)
+            if all_ratings:
+                self.engine.poisson.update_team_ratings(all_ratings)
+            self._last_ratings_version = ratings_cache.version
 
         # Step 3: Run analysis
         logger.info(f"Running batch analysis on {len(games)} games...")
-        recommendations = await self.engine.batch_analyze(games)
-        total_recs = sum(len(r) for r in recommendations.values())
+        recommendations, total_recs = await self.engine.batch_analyze(
+            games, executor=self._cpu_pool, workers=self._cpu_workers
+        )
+        self._last_total_recs = total_recs
         logger.info(f"Analysis complete: {total_recs} recommendations")
 
-        # Step 4: Update UI
-        self.dashboard.update_recommendations(recommendations)
-        
-        # Update history
+        # Step 4: Update UI in one batch (games were pushed after the scrape).
+        # History, stats, scraper statuses and strategy stats are only included
+        # when they changed since the last cycle.
+        sections = {"recommendations": recommendations}
+
         bets = self.history.get_recent_bets(50)
-        self.dashboard.update_history(bets)
-        
-        # Update stats
+        if self._changed("bets", self._bets_fingerprint(bets)):
+            sections["history"] = bets
+
         stats = self.history.get_stats(30)
-        self.dashboard.update_stats(stats)
-        
-        # Update scraper statuses
-        self.dashboard.update_scraper_statuses(self.scraper_manager.get_scraper_statuses())
-        
-        # Update strategy stats
+        if self._changed("stats", hash(tuple(stats.items()))):
+            sections["stats"] = stats
+
+        statuses = self.scraper_manager.get_scraper_statuses()
+        if self._changed("scraper", hash(tuple(statuses.items()))):
+            sections["scraper_statuses"] = statuses
+
         strategy_stats = self.strategic_bettor.get_session_stats()
-        self.dashboard.update_strategy_stats(strategy_stats)
+        if self._changed("strategy", hash(tuple(strategy_stats.items()))):
+            sections["strategy_stats"] = strategy_stats
+
+        self.dashboard.update_batch(**sections)
 
         # Step 5: Auto-betting
         if self.auto_bettor and self.auto_bettor.enabled:
@@ -270,23 +391,102 @@ class BetMasterAgent:
         # Status update
         status = (
             f"● Live: {len(games)} games | {total_recs} opportunities | "
-            f"{'🤖 AUTO-ON' if self.auto_bettor and self.auto_bettor.enabled else '👤 Auto-OFF'} | "
-            f"{config.STRATEGY_MODE.title()}"
+            f"{self.AUTO_ON_LABEL if self.auto_bettor and self.auto_bettor.enabled else self.AUTO_OFF_LABEL} | "
+            f"{self._strategy_label}"
         )
         self.dashboard.update_status(status)
 
+    def _changed(self, key: str, fingerprint: int) -> bool:
+        """True (and remembered) if `fingerprint` differs from the last push for `key`."""
+        if fingerprint == self._last_hashes[key]:
+            return False
+        self._last_hashes[key] = fingerprint
+        return True
+
+    @staticmethod
+    def _bets_fingerprint(bets) -> int:
+        return hash(tuple((b["id"], b["status"], b["pnl"]) for b in bets))
+
+    def _push_history(self):
+        """Push recent bets to the dashboard if they changed."""
+        bets = self.history.get_recent_bets(50)
+        if self._changed("bets", self._bets_fingerprint(bets)):
+            self.dashboard.update_history(bets)
+
+    def _track_leagues(self, games):
+        """
+        Remember which supported leagues have live games. A league that
+        wasn't seen in the previous cycles gets its stats fetched right away.
+        """
+        codes = self.stats_fetcher.league_codes({g.league for g in games if g.league})
+        new_codes = codes.difference(*self._recent_leagues) if self._recent_leagues else set()
+        self._recent_leagues.append(codes)
+        if new_codes:
+            logger.info(f"📊 New live leagues {sorted(new_codes)} - fetching stats")
+            task = asyncio.create_task(self._fetch_new_leagues(new_codes))
+            self._league_tasks.add(task)  # keep a reference until it finishes
+            task.add_done_callback(self._league_tasks.discard)
+
+    async def _fetch_new_leagues(self, league_codes):
+        """Fetch stats for leagues that just appeared (started by _track_leagues)."""
+        try:
+            await self.stats_fetcher.fetch_leagues(league_codes)
+        except Exception as e:
+            logger.warning(f"Stats fetch for new leagues failed: {e}")
+
     async def _fetch_stats_background(self):
-        """Fetch team stats from API in background."""
+        """
+        Fetch team stats from API in background: only leagues with live games
+        in the last cycles, or the core leagues before any games were seen.
+        """
         logger.info("📊 Fetching team statistics...")
+        league_codes = set().union(*self._recent_leagues)
         try:
-            await self.stats_fetcher.fetch_all_leagues()
+            if league_codes:
+                await self.stats_fetcher.fetch_leagues(league_codes)
+            else:
+                await self.stats_fetcher.fetch_all_leagues()
             logger.info(f"📊 Stats loaded: {len(self.stats_fetcher._cache)} teams")
         except Exception as e:
             logger.warning(f"Stats fetch failed: {e}")
 
+    async def _stats_refresh_loop(self):
+        """Keep team stats fresh for the lifetime of the agent."""
+        while self._running:
+            await self._fetch_stats_background()
+            if self.stats_fetcher.is_stale:
+                logger.warning("📊 Stats refresh incomplete - serving cached ratings")
+            await asyncio.sleep(config.STATS_CACHE_TTL // 2)
+
+    def _next_interval(self) -> float:
+        """
+        Seconds to wait before the next cycle.
+        Short while games are in play, long when nothing is live,
+        and stretched further when no dashboard is open.
+        """
+        games = self._last_games
+        if not games:
+            interval = config.REFRESH_IDLE
+        elif any(g.minute < 85 for g in games):
+            interval = config.REFRESH_LIVE
+        else:
+            # Only late games left: poll faster the more opportunities we see
+            frac = min(1.0, self._last_total_recs / 10)
+            interval = config.REFRESH_INTERVAL - (config.REFRESH_INTERVAL - config.REFRESH_LIVE) * frac
+
+        if not self.dashboard.has_active_clients:
+            # Nobody is watching - back off, but never beyond the idle interval
+            interval = max(interval, min(interval * 4, config.REFRESH_IDLE))
+
+        return interval
+
     def _trigger_refresh(self):
-        """Force immediate refresh."""
-        self._force_refresh = True
+        """Force immediate refresh (repeat clicks within 2s are ignored)."""
+        now = time.monotonic()
+        if now - self._last_refresh_trigger < 2:
+            return
+        self._last_refresh_trigger = now
+        self._refresh_event.set()
         logger.info("Manual refresh triggered")
 
     async def _handle_recheck_login(self):
@@ -296,46 +496,11 @@ class BetMasterAgent:
 
     def _handle_manual_bet(self, rec):
         """Record a manually placed bet."""
-        if isinstance(rec, dict):
-            bet_id = self.history.record_bet(
-                site=rec.get("site", "unknown"),
-                game_id=rec.get("game_id", ""),
-                home_team=rec.get("home_team", "Unknown"),
-                away_team=rec.get("away_team", "Unknown"),
-                home_score=rec.get("home_score", 0),
-                away_score=rec.get("away_score", 0),
-                minute=rec.get("minute", 0),
-                bet_type=rec.get("bet_type", ""),
-                bet_label=rec.get("bet_label", "Bet"),
-                odds=rec.get("odds", 1.0),
-                stake=rec.get("recommended_stake", 0),
-                confidence=rec.get("confidence", 0),
-                model_probability=rec.get("model_probability", 0),
-                edge=rec.get("edge", 0),
-                auto_placed=False,
-            )
-        else:
-            bet_id = self.history.record_bet(
-                site=rec.game.site,
-                game_id=rec.game.game_id,
-                home_team=rec.game.home_team,
-                away_team=rec.game.away_team,
-                home_score=rec.game.home_score,
-                away_score=rec.game.away_score,
-                minute=rec.game.minute,
-                bet_type=rec.bet_type,
-                bet_label=rec.bet_label,
-                odds=rec.odds,
-                stake=rec.recommended_stake,
-                confidence=rec.confidence,
-                model_probability=rec.model_probability,
-                edge=rec.edge,
-                auto_placed=False,
-            )
+        kwargs = {field: _extract_bet_field(rec, path) for field, path, _ in _BET_FIELDS}
+        bet_id = self.history.record_bet(auto_placed=False, **kwargs)
         logger.info(f"👤 Manual bet #{bet_id} recorded")
         
-        bets = self.history.get_recent_bets(50)
-        self.dashboard.update_history(bets)
+        self._push_history()
 
     def _handle_auto_bet_toggle(self, enabled: bool):
         """Enable or disable auto-betting."""
@@ -347,27 +512,25 @@ class BetMasterAgent:
 
     def _handle_strategy_change(self, mode: str):
         """Change betting strategy."""
-        try:
-            strategy = StrategyMode.CONSERVATIVE
-            if mode.lower() == "aggressive":
-                strategy = StrategyMode.AGGRESSIVE
-            
-            self.strategic_bettor.set_strategy(strategy)
-            logger.info(f"Strategy changed to: {mode}")
-            
-            # Update config
-            config.STRATEGY_MODE = mode
-            
-        except Exception as e:
-            logger.error(f"Strategy change failed: {e}")
+        strategy = _STRATEGY_MAP.get(mode.lower())
+        if strategy is None:
+            logger.warning(f"Unknown strategy mode '{mode}' - keeping {self._strategy.value}")
+            return
+
+        self._strategy = strategy
+        self.strategic_bettor.set_strategy(strategy)
+        logger.info(f"Strategy changed to: {mode}")
+
+        # Update config and the cached status label
+        config.STRATEGY_MODE = strategy.value
+        self._strategy_label = strategy.value.title()
 
     def _on_bet_placed(self, rec, bet_id: int, success: bool):
         """Called when auto-bettor places a bet."""
-        bets = self.history.get_recent_bets(50)
-        self.dashboard.update_history(bets)
+        self._push_history()
 
     def _on_bet_blocked(self, rec, reason: str):
-        logger.debug(f"Bet blocked: {reason}")
+        logger.debug("Bet blocked: %s", reason)
 
 
 if __name__ == "__main__":
@@ -7,20 +7,33 @@ Kelly Criterion implementation for stake sizing.
 Reference: en.wikipedia.org/wiki/Kelly_criterion
 """
 
+import bisect
+import heapq
 import logging
+from operator import attrgetter
+from collections import OrderedDict
+from concurrent.futures import Executor
 from dataclasses import dataclass, field
-from typing import Optional, Dict, List, Tuple
+from types import MappingProxyType
+from typing import Optional, Dict, List, Mapping, Tuple
 from scraper.base_scraper import LiveGame
-from analyzer.poisson_model import PoissonModel
+from analyzer.poisson_model import PoissonModel, batch_probabilities
 from analyzer.ollama_analyzer import OllamaAnalyzer
 from analyzer.news_sentiment import NewsSentiment
 import asyncio
+import numpy as np
 import config
 
 logger = logging.getLogger(__name__)
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
-@dataclass
+
+@dataclass(slots=True)
 class BetRecommendation:
     """A single bet recommendation with all supporting data."""
     game: LiveGame
@@ -52,6 +65,11 @@ class BetRecommendation:
     def is_auto_bettable(self) -> bool:
         return self.confidence >= config.AUTO_BET_THRESHOLD and self.edge > 0
 
+    @property
+    def confidence_tier(self) -> int:
+        """Index of confidence_label in _CONFIDENCE_LABELS (0 = Low ... 3 = Very High)."""
+        return bisect.bisect_right(_LABEL_THRESHOLDS, self.confidence)
+
 
 BET_LABELS = {
     "home": "Home Win",
@@ -65,6 +83,87 @@ BET_LABELS = {
     "btts_no": "Both Teams NOT to Score",
 }
 
+# Confidence label brackets: label i applies from threshold i-1 up
+_LABEL_THRESHOLDS = (55, 70, 85)
+_CONFIDENCE_LABELS = ("⚠️ Low", "⚡ Medium", "✅ High", "🔥 Very High")
+
+# Markets evaluated per game, as parallel tuples: row i of every per-game
+# array (odds, probability, edge, ...) is market i.
+BET_TYPES = ("home", "draw", "away", "over_25", "under_25", "btts", "btts_no")
+ODDS_ATTRS = (
+    "odds_home_win", "odds_draw", "odds_away_win",
+    "odds_over_25", "odds_under_25", "odds_btts_yes", "odds_btts_no",
+)
+PROB_KEYS = ("home_win", "draw", "away_win", "over_25", "under_25", "btts", "btts_no")
+_ODDS_GETTER = attrgetter(*ODDS_ATTRS)
+
+
+def _state_scores(home_score: int, away_score: int, minute: int, xg_total: float) -> np.ndarray:
+    """
+    Game-state score per market (BET_TYPES order): does the current game
+    state support the bet? Plain scalar code so numba can compile it.
+    """
+    out = np.empty(7)
+    diff = home_score - away_score
+    total = home_score + away_score
+
+    # 1X2: consistent with scoreline
+    close = 55.0 if abs(diff) <= 1 else 30.0
+    out[0] = 80.0 if diff >= 1 else close
+    out[1] = 75.0 if diff == 0 else close
+    out[2] = 80.0 if diff <= -1 else close
+
+    # Over 2.5: already at 2 goals with 30+ min remaining = very good
+    if total >= 2 and minute < 60:
+        out[3] = 90.0
+    elif total >= 1:
+        out[3] = 70.0
+    elif xg_total > 1.2:
+        out[3] = 60.0
+    else:
+        out[3] = 40.0
+
+    # Under 2.5: 0-0 at 65 min = good under bet
+    if total == 0 and minute > 55:
+        out[4] = 88.0
+    elif total <= 1 and minute > 40:
+        out[4] = 70.0
+    elif total >= 3:
+        out[4] = 5.0
+    else:
+        out[4] = 50.0
+
+    # BTTS yes / no
+    if home_score > 0 and away_score > 0:
+        out[5] = 95.0
+    elif (home_score > 0 or away_score > 0) and minute < 65:
+        out[5] = 65.0
+    else:
+        out[5] = 40.0
+    out[6] = 85.0 if home_score == 0 and away_score == 0 and minute > 50 else 40.0
+    return out
+
+
+if NUMBA_AVAILABLE:
+    _state_scores = njit(cache=True)(_state_scores)
+
+
+def _market_metrics(odds: np.ndarray, prob: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Implied probability, edge and Kelly fraction per market, in one pass.
+
+    Kelly Criterion: f* = (bp - q) / b, with b = odds - 1 (net odds),
+    p = our win probability, q = 1 - p. Since bp - q = p*odds - 1 =
+    odds * edge, this is f* = edge * odds / b, reusing the edge.
+    Using fractional Kelly (config.KELLY_FRACTION) for safety.
+    Odds must be > 1.
+    """
+    implied = 1.0 / odds
+    edge = prob - implied
+    kelly = np.maximum(0, edge * odds / (odds - 1))  # No negative Kelly (don't bet)
+    kelly *= config.KELLY_FRACTION  # Apply fraction for conservatism
+    return implied, edge, np.minimum(kelly, 0.15)  # Cap at 15% of bankroll per bet
+
 
 class ConfidenceEngine:
     """
@@ -74,65 +173,113 @@ class ConfidenceEngine:
     with confidence scores and stake sizes.
     """
 
+    # Games whose last recommendations are kept for reuse while their state is unchanged
+    REC_CACHE_SIZE = 512
+
     def __init__(self):
         self.poisson = PoissonModel()
         self.ollama = OllamaAnalyzer(model_name=config.OLLAMA_MODEL, base_url=config.OLLAMA_URL)
         self.sentiment = NewsSentiment()
         self._form_cache: Dict[str, dict] = {}   # Team recent form cache
-
-    async def analyze_game(self, game: LiveGame) -> List[BetRecommendation]:
+        self._ai_slots = asyncio.Semaphore(config.OLLAMA_CONCURRENCY)
+        # STAKE_CONFIG brackets in ascending order, for bisect lookups
+        self._stake_thresholds = tuple(sorted(config.STAKE_CONFIG))
+        self._stake_ranges = tuple(config.STAKE_CONFIG[t] for t in self._stake_thresholds)
+        # game_id -> (state key, recommendations) from the last analysis
+        self._rec_cache: "OrderedDict[str, Tuple[Tuple, List[BetRecommendation]]]" = OrderedDict()
+
+    async def analyze_game(
+        self, game: LiveGame,
+        precomputed: Optional[Tuple[Dict[str, float], int, int]] = None,
+        momentum_msg: Optional[str] = None,
+    ) -> List[BetRecommendation]:
         """
         Full analysis of a live game.
+        `precomputed` is (probs, predicted_h, predicted_a) from the Poisson
+        cache or a worker process; computed here otherwise.
+        `momentum_msg` is shared by a batch; computed here otherwise.
         Returns list of BetRecommendation sorted by confidence (highest first).
         """
-        # ... logic ...
-        recommendations = []
+        state_key = self._state_key(game)
+        cached = self._cached_recs(game, state_key)
+        if cached is not None:
+            return cached
+
+        prepared = self._prepare(game, precomputed)
+        recs = []
+        if prepared is not None:
+            game_state = prepared[-1]
+            ai_analysis = await self._ai_analysis(game_state) if game_state else {}
+            if momentum_msg is None:
+                momentum_msg = self._momentum()
+            recs = self._finalize(game, prepared, ai_analysis, momentum_msg)
+        self._store_recs(game, state_key, recs)
+        return recs
+
+    def _state_key(self, game: LiveGame) -> Tuple:
+        """Everything the recommendations for `game` depend on."""
+        return (
+            game.home_team, game.away_team, game.home_score, game.away_score, game.minute,
+            *_ODDS_GETTER(game), self.poisson.ratings_version,
+        )
 
+    def _cached_recs(self, game: LiveGame, state_key: Tuple) -> Optional[List[BetRecommendation]]:
+        """Last recommendations for this game if its state is unchanged, else None."""
+        entry = self._rec_cache.get(game.game_id)
+        if entry is None or entry[0] != state_key:
+            return None
+        self._rec_cache.move_to_end(game.game_id)
+        recs = entry[1]
+        for rec in recs:
+            rec.game = game  # Point at this poll's game object
+        return recs
+
+    def _store_recs(self, game: LiveGame, state_key: Tuple, recs: List[BetRecommendation]):
+        self._rec_cache[game.game_id] = (state_key, recs)
+        self._rec_cache.move_to_end(game.game_id)
+        if len(self._rec_cache) > self.REC_CACHE_SIZE:
+            self._rec_cache.popitem(last=False)
+
+    def _prepare(
+        self, game: LiveGame,
+        precomputed: Optional[Tuple[Dict[str, float], int, int]] = None,
+    ) -> Optional[Tuple[Dict[str, float], str, np.ndarray, np.ndarray, Optional[Dict]]]:
+        """
+        Model step for one game, before any AI call.
+        Returns (probs, predicted_score, odds_vec, prob_vec, game_state), with
+        the vectors in BET_TYPES order (missing odds are NaN), where
+        game_state is the Ollama input if the game is worth asking about,
+        or None if the game is skipped entirely.
+        """
         # Skip very late games (unreliable in-play odds)
         # Allow pre-match (minute=0) and live games
         if game.minute > 85:
-            logger.debug(f"Skipping {game.home_team} vs {game.away_team} - game too late (minute {game.minute})")
-            return []
+            logger.debug("Skipping %s vs %s - game too late (minute %s)", game.home_team, game.away_team, game.minute)
+            return None
         
-        logger.debug(f"Analyzing: {game.home_team} vs {game.away_team}, minute={game.minute}")
+        logger.debug("Analyzing: %s vs %s, minute=%s", game.home_team, game.away_team, game.minute)
 
         # Get Poisson probabilities
-        probs = self.poisson.get_all_probabilities(
-            game.home_team, game.away_team,
-            game.home_score, game.away_score, game.minute
-        )
+        if precomputed:
+            probs, predicted_h, predicted_a = precomputed
+        else:
+            probs, predicted_h, predicted_a = self.poisson.predict(
+                game.home_team, game.away_team,
+                game.home_score, game.away_score, game.minute
+            )
+        predicted_score = f"{predicted_h}-{predicted_a}"
 
-        predicted_h, predicted_a = self.poisson.get_most_likely_final_score(
-            game.home_team, game.away_team,
-            game.home_score, game.away_score, game.minute
+        # Odds and model probability of each market (None odds become NaN)
+        odds_vec = np.array(_ODDS_GETTER(game), dtype=np.float64)
+        prob_vec = np.fromiter(
+            (probs.get(key, 0.0) for key in PROB_KEYS), dtype=np.float64, count=len(PROB_KEYS)
         )
-        predicted_score = f"{predicted_h}-{predicted_a}"
 
-        # Get Sentiment/Momentum Score
-        # We assume attacks/dangerous_attacks might be available in game object (if scraper provides it)
-        # For now, we use a simple heuristic or the mock sentiment
-        momentum_msg = self.sentiment.analyze_momentum(10, 5) # Placeholder values until scraper provides live stats
-
-        # Evaluate each available market
-        markets_to_check = [
-            ("home", game.odds_home_win, probs.get("home_win", 0)),
-            ("draw", game.odds_draw, probs.get("draw", 0)),
-            ("away", game.odds_away_win, probs.get("away_win", 0)),
-            ("over_25", game.odds_over_25, probs.get("over_25", 0)),
-            ("under_25", game.odds_under_25, probs.get("under_25", 0)),
-            ("btts", game.odds_btts_yes, probs.get("btts", 0)),
-            ("btts_no", game.odds_btts_no, probs.get("btts_no", 0)),
-        ]
-
-        # Prepare AI Analysis Promise (fire once per game if needed, or lazily)
         # We only query AI if we find at least one potential bet to avoid spamming Ollama
-        potential_bet_found = False
-        for _, odds, model_prob in markets_to_check:
-            if odds and odds > 1.0 and model_prob > 0.4: # Only if reasonable probability
-                 potential_bet_found = True
-                 break
-        
-        ai_analysis = {}
+        # (priced market with a reasonable probability)
+        potential_bet_found = ((odds_vec > 1.0) & (prob_vec > 0.4)).any()
+
+        game_state = None
         if potential_bet_found and self.ollama.is_available:
              # Basic state for AI
              game_state = {
@@ -145,67 +292,105 @@ class ConfidenceEngine:
                  "odds_draw": game.odds_draw,
                  "odds_away_win": game.odds_away_win,
              }
-             # Wait for AI analysis (or we could parallelize this outside)
-             ai_analysis = await self.ollama.analyze_game(game_state)
 
+        return probs, predicted_score, odds_vec, prob_vec, game_state
 
-        for bet_type, odds, model_prob in markets_to_check:
-            if not odds or odds <= 1.0 or model_prob <= 0:
-                continue
+    def _momentum(self) -> str:
+        """
+        Get Sentiment/Momentum Score.
+        Same for every game until scrapers provide live attack stats, so a
+        batch computes it once; then it moves to _prepare with per-game values.
+        """
+        return self.sentiment.analyze_momentum(10, 5) # Placeholder values until scraper provides live stats
+
+    async def _ai_analysis(self, game_state: Dict):
+        """Ollama analysis for one game, bounded by config.OLLAMA_CONCURRENCY."""
+        async with self._ai_slots:
+            return await self.ollama.analyze_game(game_state)
+
+    def _finalize(
+        self, game: LiveGame,
+        prepared: Tuple[Dict[str, float], str, np.ndarray, np.ndarray, Optional[Dict]],
+        ai_analysis,
+        momentum_msg: str,
+    ) -> List[BetRecommendation]:
+        """Score the prepared markets and build the recommendations."""
+        probs, predicted_score, odds_arr, prob_arr, _ = prepared
+        recommendations = []
+        momentum_reason = f"Momentum: {momentum_msg}"
+        # Remaining xG is the same for every market of the game
+        h_xg = probs.get("home_xg", 0)
+        a_xg = probs.get("away_xg", 0)
 
-            implied_prob = 1.0 / odds
-            edge = model_prob - implied_prob
+        # Score every market at once (array rows follow BET_TYPES order)
+        valid = (odds_arr > 1.0) & (prob_arr > 0)
+        safe_odds = np.where(valid, odds_arr, 2.0)  # Placeholder avoids 1/0 on rows masked out below
+        implied_arr, edge_arr, kelly_arr = _market_metrics(safe_odds, prob_arr)
+
+        # Early reject: state, odds and time can add at most 40 points on top
+        # of the value score, so markets that can't reach the display
+        # threshold even then are dropped before the rest is computed
+        value_arr = self._value_score(prob_arr, edge_arr)
+        # Allow slightly negative edge bets too (for variety with default ratings)
+        candidates = valid & (edge_arr >= -0.15) & (value_arr + 40 >= config.MIN_DISPLAY_CONFIDENCE)
+        if not candidates.any():
+            return []
 
-            # Allow slightly negative edge bets too (for variety with default ratings)
-            if edge < -0.15:
-                continue
+        # Confidence score (weighted)
+        state_arr = _state_scores(
+            game.home_score, game.away_score, game.minute,
+            float(h_xg + a_xg),
+        )
+        confidence_arr = self._calculate_confidence(
+            value_arr, safe_odds, state_arr, game.minute
+        )
 
-            # Kelly Criterion
-            kelly = self._kelly_fraction(model_prob, odds)
-            
-            # Confidence score (weighted)
-            confidence = self._calculate_confidence(
-                model_prob, implied_prob, edge, kelly,
-                game, bet_type, probs
-            )
+        keep = candidates & (confidence_arr >= config.MIN_DISPLAY_CONFIDENCE)
+
+        for i in np.flatnonzero(keep):
+            bet_type = BET_TYPES[i]
+            odds = float(odds_arr[i])
+            model_prob = float(prob_arr[i])
+            implied_prob = float(implied_arr[i])
+            edge = float(edge_arr[i])
+            kelly = float(kelly_arr[i])
+            confidence = float(confidence_arr[i])
 
             # --- AI ADJUSTMENT ---
             # Skip AI for now - Ollama is timing out
             # TODO: Re-enable when Ollama is faster
             ai_reasons = []
             # if ai_analysis and hasattr(ai_analysis, 'recommended_bet'):
-                # If AI recommends this specific bet type, boost confidence
-                ai_rec = ai_analysis.recommended_bet.lower() if ai_analysis.recommended_bet else ""
-                ai_conf = ai_analysis.confidence
-                ai_reason = ai_analysis.reasoning
-                
-                # Simple string matching for AI recommendation
-                match_ai = False
-                if "home" in ai_rec and bet_type == "home": match_ai = True
-                elif "away" in ai_rec and bet_type == "away": match_ai = True
-                elif "over" in ai_rec and bet_type == "over_25": match_ai = True
-                
-                if match_ai:
-                    # boost confidence by up to 15 points based on AI confidence
-                    boost = (ai_conf / 100.0) * 15
-                    confidence = min(100, confidence + boost)
-                    ai_reasons.append(f"🤖 AI supports this: {ai_reason}")
-                elif ai_rec != "none" and ai_rec != "":
-                     # AI suggests something else
-                     pass
-            
-            if confidence < config.MIN_DISPLAY_CONFIDENCE:
-                continue
+            #     # If AI recommends this specific bet type, boost confidence
+            #     ai_rec = ai_analysis.recommended_bet.lower() if ai_analysis.recommended_bet else ""
+            #     ai_conf = ai_analysis.confidence
+            #     ai_reason = ai_analysis.reasoning
+            #
+            #     # Simple string matching for AI recommendation
+            #     match_ai = False
+            #     if "home" in ai_rec and bet_type == "home": match_ai = True
+            #     elif "away" in ai_rec and bet_type == "away": match_ai = True
+            #     elif "over" in ai_rec and bet_type == "over_25": match_ai = True
+            #
+            #     if match_ai:
+            #         # boost confidence by up to 15 points based on AI confidence
+            #         boost = (ai_conf / 100.0) * 15
+            #         confidence = min(100, confidence + boost)
+            #         ai_reasons.append(f"🤖 AI supports this: {ai_reason}")
+            #     elif ai_rec != "none" and ai_rec != "":
+            #          # AI suggests something else
+            #          pass
+            # (When re-enabled, apply the MIN_DISPLAY_CONFIDENCE filter after the boost.)
 
             # Stake recommendation
             stake = self._recommend_stake(confidence, kelly)
 
             # Build reasons list
             reasons, warnings = self._build_reasoning(
-                game, bet_type, model_prob, implied_prob, edge, probs, confidence
+                game, bet_type, model_prob, implied_prob, edge, h_xg, a_xg, confidence
             )
             reasons.extend(ai_reasons)
-            reasons.append(f"Momentum: {momentum_msg}")
+            reasons.append(momentum_reason)
 
             rec = BetRecommendation(
                 game=game,
@@ -219,46 +404,39 @@ class ConfidenceEngine:
                 confidence_label=self._confidence_label(confidence),
                 recommended_stake=stake,
                 kelly_fraction=round(kelly, 4),
-                home_xg=probs.get("home_xg", 0),
-                away_xg=probs.get("away_xg", 0),
+                home_xg=h_xg,
+                away_xg=a_xg,
                 predicted_score=predicted_score,
                 reasons=reasons,
                 warnings=warnings,
             )
             recommendations.append(rec)
 
-        # Sort: highest confidence first
-        recommendations.sort(key=lambda r: (r.confidence, r.edge), reverse=True)
-        return recommendations[:5]
+        # Top 5: highest confidence first
+        return heapq.nlargest(5, recommendations, key=lambda r: (r.confidence, r.edge))
 
-    def _kelly_fraction(self, prob: float, odds: float) -> float:
+    def _value_score(self, model_prob: np.ndarray, edge: np.ndarray) -> np.ndarray:
         """
-        Kelly Criterion: f* = (bp - q) / b
-        b = odds - 1 (net odds)
-        p = our win probability
-        q = 1 - p (loss probability)
-        
-        Using fractional Kelly (config.KELLY_FRACTION) for safety.
+        Confidence components 1 and 2 (model probability and value edge),
+        worth up to 60 of the 100 points. Element-wise over markets.
         """
-        b = odds - 1
-        p = prob
-        q = 1 - p
-        
-        if b <= 0:
-            return 0.0
-        
-        kelly = (b * p - q) / b
-        kelly = max(0, kelly)  # No negative Kelly (don't bet)
-        kelly *= config.KELLY_FRACTION  # Apply fraction for conservatism
-        
-        return min(kelly, 0.15)  # Cap at 15% of bankroll per bet
+        # 1. Model probability: how strongly does our model back this?
+        # 50% model prob → 0 confidence boost; 90% → high confidence
+        prob_score = np.maximum(0, (model_prob - 0.45) / 0.55) * 100
+        model_part = np.minimum(100, prob_score) * 0.35
+
+        # 2. Value edge: positive edge boosts confidence
+        edge_score = np.clip((edge + 0.05) / 0.25, 0, 1) * 100
+        edge_part = edge_score * 0.25
+        return model_part + edge_part
 
     def _calculate_confidence(
-        self, model_prob: float, implied_prob: float, edge: float,
-        kelly: float, game: LiveGame, bet_type: str, probs: dict
-    ) -> float:
+        self, value_score: np.ndarray, odds: np.ndarray,
+        state_score: np.ndarray, minute: int
+    ) -> np.ndarray:
         """
-        Weighted confidence score combining multiple signals.
+        Weighted confidence score combining multiple signals, element-wise
+        over markets. `value_score` is components 1+2 from _value_score.
         
         Components:
         1. Model probability strength (35%)
@@ -267,129 +445,49 @@ class ConfidenceEngine:
         4. Odds reasonableness (10%)
         5. Time factor (10%)
         """
-        scores = {}
-
-        # 1. Model probability: how strongly does our model back this?
-        # 50% model prob → 0 confidence boost; 90% → high confidence
-        prob_score = max(0, (model_prob - 0.45) / 0.55) * 100
-        scores["model"] = min(100, prob_score) * 0.35
-
-        # 2. Value edge: positive edge boosts confidence
-        edge_score = max(0, min(1, (edge + 0.05) / 0.25)) * 100
-        scores["edge"] = edge_score * 0.25
-
         # 3. Game state: is current score consistent with prediction?
-        state_score = self._game_state_score(game, bet_type, probs)
-        scores["state"] = state_score * 0.20
+        state_part = state_score * 0.20
 
         # 4. Odds reasonableness: avoid extreme odds (1.1 or 50.0+)
-        odds = 1.0 / implied_prob if implied_prob > 0 else 100
-        if 1.3 <= odds <= 5.0:
-            odds_score = 100
-        elif 1.1 <= odds < 1.3 or 5.0 < odds <= 8.0:
-            odds_score = 60
-        else:
-            odds_score = 20
-        scores["odds"] = odds_score * 0.10
+        in_good = (odds >= 1.3) & (odds <= 5.0)
+        in_ok = ((odds >= 1.1) & (odds < 1.3)) | ((odds > 5.0) & (odds <= 8.0))
+        odds_score = np.where(in_good, 100, np.where(in_ok, 60, 20))
+        odds_part = odds_score * 0.10
 
         # 5. Time factor: avoid last 5 minutes (chaotic) and first 10
-        minute = game.minute
-        if 15 <= minute <= 75:
-            time_score = 100
-        elif 10 <= minute < 15 or 75 < minute <= 80:
-            time_score = 70
-        else:
-            time_score = 30
-        scores["time"] = time_score * 0.10
+        # Band masks instead of branches: 100 in 15-75, 70 in 10-15 / 75-80, else 30
+        in_core = (15 <= minute) & (minute <= 75)
+        in_edge = ((10 <= minute) & (minute < 15)) | ((75 < minute) & (minute <= 80))
+        time_score = 30 + 70 * in_core + 40 * in_edge
+        time_part = time_score * 0.10
 
-        total = sum(scores.values())
-        return max(0, min(100, total))
-
-    def _game_state_score(self, game: LiveGame, bet_type: str, probs: dict) -> float:
-        """
-        Score based on whether current game state supports the bet.
-        """
-        h = game.home_score
-        a = game.away_score
-        total = h + a
-
-        if bet_type == "over_25":
-            # Already at 2 goals with 30+ min remaining = very good
-            if total >= 2 and game.minute < 60:
-                return 90
-            elif total >= 1:
-                return 70
-            elif probs.get("home_xg", 0) + probs.get("away_xg", 0) > 1.2:
-                return 60
-            return 40
-
-        elif bet_type == "under_25":
-            # 0-0 at 65 min = good under bet
-            if total == 0 and game.minute > 55:
-                return 88
-            elif total <= 1 and game.minute > 40:
-                return 70
-            elif total >= 3:
-                return 5
-            return 50
-
-        elif bet_type in ("home", "away", "draw"):
-            # Consistent with scoreline
-            diff = h - a
-            if bet_type == "home" and diff >= 1:
-                return 80
-            elif bet_type == "away" and diff <= -1:
-                return 80
-            elif bet_type == "draw" and diff == 0:
-                return 75
-            elif abs(diff) <= 1:
-                return 55
-            return 30
-
-        elif bet_type == "btts":
-            if h > 0 and a > 0:
-                return 95
-            elif (h > 0 or a > 0) and game.minute < 65:
-                return 65
-            return 40
-
-        elif bet_type == "btts_no":
-            if h == 0 and a == 0 and game.minute > 50:
-                return 85
-            return 40
-
-        return 50
+        total = value_score + state_part + odds_part + time_part
+        return np.clip(total, 0, 100)
 
     def _recommend_stake(self, confidence: float, kelly: float) -> float:
         """
         Determine stake amount in KES based on confidence level.
         Uses config.STAKE_CONFIG thresholds.
         """
-        for min_conf in sorted(config.STAKE_CONFIG.keys(), reverse=True):
-            if confidence >= min_conf:
-                min_s, max_s = config.STAKE_CONFIG[min_conf]
-                # Scale within range based on confidence level above threshold
-                next_threshold = min_conf + 15
-                frac = min(1.0, (confidence - min_conf) / 15)
-                stake = min_s + (max_s - min_s) * frac
-                return min(round(stake, -1), config.MAX_BET_KES)  # Round to nearest 10
+        # Highest threshold the confidence reaches
+        i = bisect.bisect_right(self._stake_thresholds, confidence) - 1
+        if i >= 0:
+            min_conf = self._stake_thresholds[i]
+            min_s, max_s = self._stake_ranges[i]
+            # Scale within range based on confidence level above threshold
+            frac = min(1.0, (confidence - min_conf) / 15)
+            stake = min_s + (max_s - min_s) * frac
+            return min(round(stake, -1), config.MAX_BET_KES)  # Round to nearest 10
 
         return config.STAKE_CONFIG[0][0]  # Minimum stake
 
     def _confidence_label(self, confidence: float) -> str:
-        if confidence >= 85:
-            return "🔥 Very High"
-        elif confidence >= 70:
-            return "✅ High"
-        elif confidence >= 55:
-            return "⚡ Medium"
-        else:
-            return "⚠️ Low"
+        return _CONFIDENCE_LABELS[bisect.bisect_right(_LABEL_THRESHOLDS, confidence)]
 
     def _build_reasoning(
         self, game: LiveGame, bet_type: str,
         model_prob: float, implied_prob: float, edge: float,
-        probs: dict, confidence: float
+        h_xg: float, a_xg: float, confidence: float
     ) -> Tuple[List[str], List[str]]:
         """Build human-readable reasons and warnings for the bet."""
         reasons = []
@@ -402,26 +500,25 @@ class ConfidenceEngine:
         if edge > 0:
             reasons.append(f"Positive value edge: +{pct(edge)} (we have the mathematical edge)")
         
-        h_xg = probs.get("home_xg", 0)
-        a_xg = probs.get("away_xg", 0)
         reasons.append(f"Remaining xG: {game.home_team} {h_xg:.2f} | {game.away_team} {a_xg:.2f}")
 
         # Game state reasoning
         h = game.home_score
         a = game.away_score
         total = h + a
+        total_xg = h_xg + a_xg
 
         if bet_type == "over_25":
             if total >= 2:
                 reasons.append(f"Already {total} goals scored - over 2.5 already achieved or very near")
-            elif h_xg + a_xg > 1.0:
-                reasons.append(f"High-scoring game expected: combined xG = {h_xg+a_xg:.2f}")
+            elif total_xg > 1.0:
+                reasons.append(f"High-scoring game expected: combined xG = {total_xg:.2f}")
 
         elif bet_type == "under_25":
             if total == 0 and game.minute > 50:
                 reasons.append(f"Goalless at minute {game.minute} - under 2.5 looks likely")
-            if h_xg + a_xg < 0.8:
-                reasons.append(f"Low remaining xG ({h_xg+a_xg:.2f}) supports under bet")
+            if total_xg < 0.8:
+                reasons.append(f"Low remaining xG ({total_xg:.2f}) supports under bet")
 
         elif bet_type == "btts":
             if h > 0 and a > 0:
@@ -438,27 +535,119 @@ class ConfidenceEngine:
 
         return reasons, warnings
 
-    async def batch_analyze(self, games: List[LiveGame]) -> Dict[str, List[BetRecommendation]]:
+    def _log_recs(self, game: LiveGame, recs: List[BetRecommendation]):
+        if recs:
+            logger.info(f"Game {game.home_team} vs {game.away_team}: {len(recs)} recommendations")
+        else:
+            logger.debug("Game %s vs %s: 0 recommendations", game.home_team, game.away_team)
+
+    async def _precompute_probabilities(
+        self, games: List[LiveGame], executor: Executor, workers: int
+    ) -> List[Tuple[Dict[str, float], int, int]]:
         """
-        Analyze all games concurrently.
+        Poisson step for all games. Cached match states are served from the
+        model's memo; the rest run in `executor`, one chunk per worker
+        (`workers` = the executor's max_workers).
+        """
+        keys = [(g.home_team, g.away_team, g.home_score, g.away_score, g.minute) for g in games]
+        results = [self.poisson.cached(key) for key in keys]
+        misses = [i for i, result in enumerate(results) if result is None]
+        if misses:
+            loop = asyncio.get_running_loop()
+            chunk_size = max(1, -(-len(misses) // max(1, workers)))  # ceil division
+            args = [keys[i] for i in misses]
+            ratings = dict(self.poisson.team_ratings)
+            chunks = await asyncio.gather(*(
+                loop.run_in_executor(executor, batch_probabilities, args[i:i + chunk_size], ratings)
+                for i in range(0, len(args), chunk_size)
+            ))
+            computed = [result for chunk in chunks for result in chunk]
+            for i, result in zip(misses, computed):
+                results[i] = result
+                self.poisson.remember(keys[i], result)
+        logger.debug(
+            "Poisson cache: %d/%d hits this cycle (%d hits, %d misses total)",
+            len(games) - len(misses), len(games), self.poisson.cache_hits, self.poisson.cache_misses,
+        )
+        return results
+
+    async def batch_analyze(
+        self, games: List[LiveGame], executor: Optional[Executor] = None, workers: int = 1
+    ) -> Tuple[Mapping[str, List[BetRecommendation]], int]:
+        """
+        Analyze all games: model step, then one bounded AI gather, then scoring.
+        Games whose state is unchanged since their last analysis reuse it.
+        If `executor` is given, the Poisson math is fanned out to it first,
+        split into `workers` chunks (the executor's worker count).
+        Returns (read-only {game_id: recommendations}, total recommendation count).
         """
         results = {}
+        total = 0
         try:
-            # Create tasks for all games
-            tasks = [self.analyze_game(game) for game in games]
-            
-            # Run all analysis in parallel
-            all_recs = await asyncio.gather(*tasks, return_exceptions=True)
-            
+            state_keys = [self._state_key(game) for game in games]
+            all_recs = [self._cached_recs(game, key) for game, key in zip(games, state_keys)]
+            changed = [i for i, recs in enumerate(all_recs) if recs is None]
+            todo = [games[i] for i in changed]
+            if len(todo) < len(games):
+                logger.debug("Reusing recommendations for %d unchanged games", len(games) - len(todo))
+                for game, recs in zip(games, all_recs):
+                    if recs is not None:
+                        self._log_recs(game, recs)
+
+            precomputed = [None] * len(todo)
+            if executor and todo:
+                try:
+                    precomputed = await self._precompute_probabilities(todo, executor, workers)
+                except Exception as e:
+                    logger.warning(f"Parallel Poisson step failed, analyzing inline: {e}")
+
+            # Model step for every changed game first
+            prepared = []
+            for game, pre in zip(todo, precomputed):
+                try:
+                    prepared.append(self._prepare(game, pre))
+                except Exception as e:
+                    logger.error(f"Error analyzing {game.home_team}: {e}")
+                    prepared.append(None)
+
+            momentum_msg = self._momentum()
+
+            def finish(i: int, ai_analysis):
+                """Score changed game i, then cache and log its recommendations."""
+                game = todo[i]
+                try:
+                    recs = self._finalize(game, prepared[i], ai_analysis, momentum_msg) if prepared[i] else []
+                except Exception as e:
+                    logger.error(f"Error analyzing {game.home_team}: {e}")
+                    return
+                self._store_recs(game, state_keys[changed[i]], recs)
+                all_recs[changed[i]] = recs
+                self._log_recs(game, recs)
+
+            async def ask_ai_then_finish(i: int):
+                ai_analysis = {}
+                try:
+                    ai_analysis = await self._ai_analysis(prepared[i][-1])
+                except Exception as e:
+                    logger.error(f"AI analysis error for {todo[i].home_team}: {e}")
+                finish(i, ai_analysis)
+
+            # Games worth asking the AI about are scored as each answer arrives
+            # (concurrency bounded by _ai_slots); the rest are scored right away
+            async with asyncio.TaskGroup() as tg:
+                needs_ai = [bool(prep and prep[-1]) for prep in prepared]
+                for i, ask in enumerate(needs_ai):
+                    if ask:
+                        tg.create_task(ask_ai_then_finish(i))
+                for i, ask in enumerate(needs_ai):
+                    if not ask:
+                        finish(i, {})
+
+            # Results keep the input game order (auto-betting walks them in order)
             for game, recs in zip(games, all_recs):
-                if isinstance(recs, Exception):
-                    logger.error(f"Error analyzing {game.home_team}: {recs}")
-                    continue
                 if recs:
                     results[game.game_id] = recs
-                    logger.info(f"Game {game.home_team} vs {game.away_team}: {len(recs)} recommendations")
-                else:
-                    logger.debug(f"Game {game.home_team} vs {game.away_team}: 0 recommendations")
+                    total += len(recs)
         except Exception as e:
             logger.error(f"Batch analyze error: {e}")
-        return results
+        return MappingProxyType(results), total
@@ -6,9 +6,13 @@ Inspired by: github.com/microsoft/playwright-python examples
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from enum import Enum
+import asyncio
+import hashlib
 import logging
+import aiohttp
+import config
 
 class ScraperStatus(Enum):
     IDLE = "IDLE"
@@ -20,9 +24,12 @@ class ScraperStatus(Enum):
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LiveGame:
-    """Represents a single live football game with odds."""
+    """
+    Represents a single live football game with odds.
+    Frozen: scrapers reuse unchanged instances across polls, so derive new ones with replace().
+    """
     game_id: str
     home_team: str
     away_team: str
@@ -48,6 +55,45 @@ class LiveGame:
     extra_markets: dict = field(default_factory=dict)  # Any extra odds
 
 
+# Never needed for odds: aborted before they hit the network.
+# Stylesheets stay, since innerText and click targets depend on layout.
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+_BLOCKED_HOSTS = ("google-analytics", "googletagmanager", "doubleclick", "hotjar", "sentry", "facebook.net")
+
+
+async def _block_heavy_requests(route):
+    request = route.request
+    if request.resource_type in _BLOCKED_RESOURCE_TYPES or any(h in request.url for h in _BLOCKED_HOSTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def dig(data: dict, *paths: Tuple[str, ...], default=None):
+    """
+    Value at the first key path present in `data`, e.g. dig(ev, ("O1",), ("homeTeam", "name")).
+    Short-circuits on the first hit, without the throwaway {} of chained .get(k, {}).get(...).
+    """
+    for path in paths:
+        value = data
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+            if value is None:
+                break
+        else:
+            return value
+    return default
+
+
+def dom_game_id(prefix: str, home: str, away: str) -> str:
+    """
+    Stable id for a game scraped from the DOM (no site id available).
+    Builtin hash() is salted per process, so it would change on every restart.
+    """
+    digest = hashlib.blake2b(f"{home}|{away}".encode(), digest_size=8).hexdigest()
+    return f"{prefix}_{digest}"
+
+
 class BaseScraper(ABC):
     """
     Abstract scraper. Subclass this for each betting site.
@@ -56,12 +102,20 @@ class BaseScraper(ABC):
     and adapted from: github.com/nicholasmccullum/python-automation
     """
 
+    # Shared by every scraper: caps live pages rendering at once (direct API calls skip it)
+    page_slots = asyncio.Semaphore(config.MAX_CONCURRENT_PAGES)
+
     def __init__(self, site_name: str, url: str):
         self.site_name = site_name
         self.url = url
-        self.browser = None
+        self.context = None  # Own BrowserContext on the manager's shared browser
         self.page = None
         self.status = ScraperStatus.IDLE
+        self.http: Optional[aiohttp.ClientSession] = None  # Shared session owned by the agent (never closed here)
+        self._session: Optional[aiohttp.ClientSession] = None  # Own fallback for direct API calls
+        self._session_lock = asyncio.Lock()
+        # game_id -> (LiveGame, signature) from the last feed parse
+        self._game_cache: Dict[str, Tuple[LiveGame, tuple]] = {}
 
     @abstractmethod
     async def get_live_games(self) -> List[LiveGame]:
@@ -91,23 +145,62 @@ class BaseScraper(ABC):
         """Manually trigger a check to see if we are now logged in."""
         return False
 
-    async def setup_browser(self, playwright, headless: bool = False):
-        """Initialize Playwright browser."""
-        self.browser = await playwright.chromium.launch(
-            headless=headless,
-            args=["--no-sandbox", "--disable-blink-features=AutomationControlled"]
-        )
-        context = await self.browser.new_context(
+    async def setup_context(self, browser):
+        """
+        Open this site's page in its own context on a shared browser.
+        Contexts keep cookies/logins isolated per site without a Chromium per site.
+        """
+        self.context = await browser.new_context(
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
                        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             viewport={"width": 1366, "height": 768}
         )
-        self.page = await context.new_page()
+        await self.context.route("**/*", _block_heavy_requests)
+        self.page = await self.context.new_page()
         # Hide automation signals
         await self.page.add_init_script("""
             Object.defineProperty(navigator, 'webdriver', {get: () => undefined})
         """)
 
+    def cached_game(self, game_id: str, sig: tuple) -> Optional[LiveGame]:
+        """The LiveGame parsed last poll for `game_id`, if its signature is unchanged."""
+        hit = self._game_cache.get(game_id)
+        return hit[0] if hit is not None and hit[1] == sig else None
+
+    def cache_game(self, game: LiveGame, sig: tuple) -> LiveGame:
+        self._game_cache[game.game_id] = (game, sig)
+        return game
+
+    def prune_game_cache(self, games: List[LiveGame]):
+        """Forget games that are no longer in the feed."""
+        self._game_cache = {
+            g.game_id: self._game_cache[g.game_id] for g in games if g.game_id in self._game_cache
+        }
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """The shared session, or our own keepalive session, reused across polls."""
+        if self.http and not self.http.closed:
+            return self.http
+        if self._session and not self._session.closed:
+            return self._session
+
+        # Double-checked so concurrent first callers share one session
+        async with self._session_lock:
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=60, ttl_dns_cache=300)
+                )
+            return self._session
+
+    async def enter_stake(self, stake_input, stake: float):
+        """Set the stake in one fill(); type it key by key only if the field rejects a direct fill."""
+        amount = str(int(stake))
+        await stake_input.fill(amount)
+        if await stake_input.input_value() != amount:
+            # Masked inputs that only react to real keystrokes
+            await stake_input.fill("")
+            await stake_input.press_sequentially(amount, delay=0)
+
     async def safe_goto(self, url: str, timeout: int = 30000):
         """Navigate with error handling."""
         try:
@@ -118,8 +211,12 @@ class BaseScraper(ABC):
             return False
 
     async def close(self):
-        if self.browser:
-            await self.browser.close()
+        if self._session and not self._session.closed:
+            await self._session.close()
+        # Only the context: the browser belongs to the ScraperManager
+        if self.context:
+            context, self.context, self.page = self.context, None, None
+            await context.close()
 
     def implied_probability(self, odds: float) -> float:
         """Convert decimal odds to implied probability."""
@@ -4,8 +4,11 @@ Coordinates all scrapers, deduplicates games across sites.
 """
 
 import asyncio
+import dataclasses
 import logging
-from typing import List, Dict
+import re
+from functools import lru_cache
+from typing import List, Dict, Tuple
 from playwright.async_api import async_playwright
 
 from .base_scraper import LiveGame
@@ -15,6 +18,28 @@ import config
 
 logger = logging.getLogger(__name__)
 
+# Every odds field on LiveGame, merged across sites
+_ODDS_ATTRS = (
+    "odds_home_win", "odds_draw", "odds_away_win",
+    "odds_over_25", "odds_under_25", "odds_over_35", "odds_under_35",
+    "odds_btts_yes", "odds_btts_no",
+)
+
+# "FC" prefixes/suffixes and dots differ between sites for the same team
+_NORM_RE = re.compile(r"\s+fc\b|\bfc\s+|\.")
+
+
+@lru_cache(maxsize=2048)
+def _norm_team(name: str) -> str:
+    """Normalize a team name for cross-site matching (cached; names repeat every poll)."""
+    return _NORM_RE.sub("", name.lower().strip())
+
+
+@lru_cache(maxsize=1024)
+def _dedup_key(home: str, away: str) -> str:
+    """Dedup key for a fixture; memoized per raw name pair, so a repeat game is one lookup."""
+    return f"{_norm_team(home)}__vs__{_norm_team(away)}"
+
 
 class ScraperManager:
     """
@@ -32,17 +57,25 @@ class ScraperManager:
     def __init__(self):
         self.scrapers: Dict[str, any] = {}
         self.playwright = None
+        self.browser = None  # One Chromium shared by all scrapers
+        self.http = None  # Shared aiohttp session injected by the agent
         self._active = False
 
     async def start(self):
-        """Initialize Playwright and all enabled scrapers."""
+        """Initialize Playwright, the shared browser and all enabled scrapers."""
         self.playwright = await async_playwright().start()
         
         for site_name in config.ENABLED_SITES:
             if site_name in self.SCRAPER_CLASSES:
+                if self.browser is None:
+                    self.browser = await self.playwright.chromium.launch(
+                        headless=config.BROWSER_HEADLESS,
+                        args=["--no-sandbox", "--disable-blink-features=AutomationControlled"]
+                    )
                 scraper_cls = self.SCRAPER_CLASSES[site_name]
                 scraper = scraper_cls()
-                await scraper.setup_browser(self.playwright, headless=config.BROWSER_HEADLESS)
+                scraper.http = self.http
+                await scraper.setup_context(self.browser)
                 
                 # Login if credentials configured
                 if hasattr(scraper, 'login'):
@@ -72,25 +105,22 @@ class ScraperManager:
         Fetch live games from all enabled sites concurrently.
         Returns deduplicated list (same game on multiple sites = single entry with best odds).
         """
-        all_games = []
+        seen: Dict[str, LiveGame] = {}
 
-        # Scrape all sites concurrently
-        tasks = {
-            site: scraper.get_live_games()
+        # Scrape all sites concurrently; merge each site as soon as it returns
+        tasks = [
+            self._scrape_site(site, scraper)
             for site, scraper in self.scrapers.items()
-        }
-
-        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        ]
 
-        for site, result in zip(tasks.keys(), results):
-            if isinstance(result, Exception):
-                logger.error(f"[{site}] Scraping error: {result}")
-            elif result:
+        for next_done in asyncio.as_completed(tasks):
+            site, result = await next_done
+            if result:
                 logger.info(f"[{site}] Got {len(result)} games")
-                all_games.extend(result)
+                # Deduplicate: same teams = keep entry with most odds available
+                self._ingest(result, seen)
 
-        # Deduplicate: same teams = keep entry with most odds available
-        deduplicated = self._deduplicate(all_games)
+        deduplicated = list(seen.values())
         
         # Final safety filter: Human only games (in case scrapers missed it)
         human_only = [
@@ -101,53 +131,44 @@ class ScraperManager:
         logger.info(f"Total unique live human games: {len(human_only)} (filtered out {len(deduplicated) - len(human_only)})")
         return human_only
 
-    def _deduplicate(self, games: List[LiveGame]) -> List[LiveGame]:
+    async def _scrape_site(self, site: str, scraper) -> Tuple[str, List[LiveGame]]:
+        """One site's live games, or [] if it errors or exceeds SITE_TIMEOUT_S."""
+        try:
+            return site, await asyncio.wait_for(scraper.get_live_games(), timeout=config.SITE_TIMEOUT_S)
+        except asyncio.TimeoutError:
+            logger.warning(f"[{site}] ⏱️ Scrape timed out after {config.SITE_TIMEOUT_S}s - skipping this cycle")
+        except Exception as e:
+            logger.error(f"[{site}] Scraping error: {e}")
+        return site, []
+
+    def _ingest(self, games: List[LiveGame], seen: Dict[str, LiveGame]):
         """
-        Merge same game from multiple sites, keeping best available odds.
-        Key: normalized home+away team names + score.
+        Merge same game from multiple sites into `seen`, keeping best available odds.
+        Key: normalized home+away team names.
         """
-        seen: Dict[str, LiveGame] = {}
-
         for game in games:
             # Normalize team names for matching
-            key = self._make_key(game.home_team, game.away_team)
-
-            if key not in seen:
-                seen[key] = game
-            else:
-                # Merge: keep whichever has more odds data
-                existing = seen[key]
-                merged = self._merge_games(existing, game)
-                seen[key] = merged
-
-        return list(seen.values())
-
-    def _make_key(self, home: str, away: str) -> str:
-        """Normalize team names for deduplication."""
-        def normalize(name: str) -> str:
-            return name.lower().strip().replace(" fc", "").replace("fc ", "").replace(".", "")
-        return f"{normalize(home)}__vs__{normalize(away)}"
+            key = _dedup_key(game.home_team, game.away_team)
+            existing = seen.get(key)
+            # Merge: keep whichever has more odds data
+            seen[key] = game if existing is None else self._merge_games(existing, game)
 
     def _merge_games(self, a: LiveGame, b: LiveGame) -> LiveGame:
         """Merge two LiveGame entries, taking best available odds from each."""
-        # Take odds from whichever source has them
-        a.odds_home_win = a.odds_home_win or b.odds_home_win
-        a.odds_draw = a.odds_draw or b.odds_draw
-        a.odds_away_win = a.odds_away_win or b.odds_away_win
-        a.odds_over_25 = a.odds_over_25 or b.odds_over_25
-        a.odds_under_25 = a.odds_under_25 or b.odds_under_25
-        a.odds_btts_yes = a.odds_btts_yes or b.odds_btts_yes
-        a.odds_btts_no = a.odds_btts_no or b.odds_btts_no
-
-        # Prefer higher odds (better value for bettor)
-        if a.odds_home_win and b.odds_home_win:
-            a.odds_home_win = max(a.odds_home_win, b.odds_home_win)
-        if a.odds_over_25 and b.odds_over_25:
-            a.odds_over_25 = max(a.odds_over_25, b.odds_over_25)
+        merged = {}
+        for attr in _ODDS_ATTRS:
+            va, vb = getattr(a, attr), getattr(b, attr)
+            if va and vb:
+                # Prefer higher odds (better value for bettor)
+                merged[attr] = max(va, vb)
+            elif vb:
+                # Take odds from whichever source has them
+                merged[attr] = vb
 
         # Keep track of all sites offering this game
-        a.extra_markets["also_on"] = b.site
-        return a
+        extra_markets = dict(a.extra_markets, also_on=b.site)
+        # LiveGame is frozen (scrapers reuse instances), so build a new record
+        return dataclasses.replace(a, extra_markets=extra_markets, **merged)
 
     async def place_bet(self, game: LiveGame, bet_type: str, stake: float) -> bool:
         """Place bet via the appropriate site's scraper."""
@@ -158,9 +179,14 @@ class ScraperManager:
         return False
 
     async def stop(self):
-        """Cleanly close all browsers."""
-        for scraper in self.scrapers.values():
-            await scraper.close()
+        """Cleanly close all scraper contexts and the shared browser."""
+        # Contexts are independent; closing them is cheap, so do it in parallel
+        await asyncio.gather(
+            *(scraper.close() for scraper in self.scrapers.values()),
+            return_exceptions=True,
+        )
+        if self.browser:
+            await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
         self._active = False
@@ -15,18 +15,59 @@ import json
 import logging
 import re
 from typing import List
-from .base_scraper import BaseScraper, LiveGame
+from urllib.parse import urlsplit
+import aiohttp
+from .base_scraper import BaseScraper, LiveGame, dig, dom_game_id
+from .xbet_markets import MARKET_1X2, MARKET_TOTALS, MARKET_BTTS, OUTCOME_TOTAL_OVER
 import config
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Feed bodies are parsed straight from bytes
+_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Precompiled: these run per field, per row, every poll
+_SCORE_SEP_RE = re.compile(r"[-:]")
+_NON_DIGIT_RE = re.compile(r"\D")
+_NON_AMOUNT_RE = re.compile(r"[^\d.]")
+
+# Unauthenticated live-odds feed (football, first 50 events)
+_FEED_PATH = "/LiveFeed/Get1x2_VZip"
+_FEED_PARAMS = {"sports": "1", "count": "50", "lng": "en", "mode": "4"}
+
+# Reads every live row's texts in one page round trip (null = element missing)
+_DOM_ROWS_JS = """
+() => {
+    const text = (el, sel) => {
+        const found = el.querySelector(sel);
+        return found ? found.innerText : null;
+    };
+    return Array.from(
+        document.querySelectorAll(".liveLine__game, .live-event-row, [data-live-game]")
+    ).slice(0, 20).map(el => ({
+        home: text(el, ".liveLine__teamName:first-child, .team-home"),
+        away: text(el, ".liveLine__teamName:last-child, .team-away"),
+        score: text(el, ".liveLine__score, .score"),
+        minute: text(el, ".liveLine__time, .game-time"),
+        odds: Array.from(el.querySelectorAll(".odd, .coefficient, [class*='odds']"))
+            .slice(0, 5).map(btn => btn.innerText),
+    }));
+}
+"""
+
 
 class XBetScraper(BaseScraper):
 
     def __init__(self):
         super().__init__("1xbet", config.SITE_URLS["1xbet"])
-        self._captured_games = []
         self._api_response = None
+        self._feed_ready = asyncio.Event()  # Set once a feed body is captured
 
     async def get_live_games(self) -> List[LiveGame]:
         """
@@ -34,27 +75,44 @@ class XBetScraper(BaseScraper):
         1xbet loads live data via: /LiveFeed/Get1x2_VZip or similar endpoints.
         We capture these network responses directly.
         """
+        # Fast path: plain HTTP to the live feed, no page render needed
+        games = await self._fetch_via_api()
+        if games:
+            logger.info(f"[1xbet] Got {len(games)} games via direct API")
+            return games
+
+        # Rendering path: wait for a free page slot
+        async with self.page_slots:
+            return await self._scrape_page()
+
+    async def _scrape_page(self) -> List[LiveGame]:
+        """Load the live page and take odds from its feed responses, else from the DOM."""
         games = []
+        self._api_response = None  # Never fall back to last poll's odds
 
+        # Intercept network responses to capture odds data, only while scraping:
+        # the live page keeps polling its feed, and those bodies would be parsed for nothing
+        self.page.on("response", self._handle_response)
         try:
-            # Intercept network responses to capture odds data
-            self.page.on("response", self._handle_response)
-
+            # Move on as soon as the live feed answers instead of sleeping a fixed 4s
+            self._feed_ready.clear()
             await self.safe_goto(self.url)
-            
-            # Wait for live games to load
-            await self.page.wait_for_timeout(4000)
+            await self._await_feed(timeout=6.0)
 
-            # Click football/soccer filter if needed
+            # Click football/soccer filter if needed; its feed, if any, replaces the first
+            self._feed_ready.clear()
             try:
                 await self.page.click('[data-sport-id="1"], .sport-icon--football', timeout=3000)
-                await self.page.wait_for_timeout(2000)
+                await self._await_feed(timeout=3.0)
             except Exception:
                 pass  # Already on football or selector changed
 
             # If API interception worked, use that data
             if self._api_response:
-                games = self._parse_api_response(self._api_response)
+                # Take the tree rather than keep it alive until the next poll
+                data, self._api_response = self._api_response, None
+                # Parse off the event loop so other sites keep scraping meanwhile
+                games = await asyncio.to_thread(self._parse_api_response, data)
                 logger.info(f"[1xbet] Got {len(games)} games via API interception")
             else:
                 # Fallback: DOM scraping
@@ -63,22 +121,59 @@ class XBetScraper(BaseScraper):
 
         except Exception as e:
             logger.error(f"[1xbet] Scraping failed: {e}")
+        finally:
+            self.page.remove_listener("response", self._handle_response)
 
         return games
 
+    async def _fetch_via_api(self) -> List[LiveGame]:
+        """Fetch the live feed directly; [] on any failure (non-200, geo-block, HTML page)."""
+        origin = "{0.scheme}://{0.netloc}".format(urlsplit(self.url))
+        headers = {
+            "User-Agent": "Mozilla/5.0",
+            "Accept": "application/json",
+            "Referer": f"{origin}/",
+        }
+        try:
+            session = await self.get_session()
+            async with session.get(origin + _FEED_PATH, params=_FEED_PARAMS, headers=headers,
+                                   timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                if resp.status == 200:
+                    # Parsed from bytes, so a text/plain content type is fine too
+                    data = _loads(await resp.read())
+                    return await asyncio.to_thread(self._parse_api_response, data)
+                logger.debug(f"[1xbet] Direct API returned {resp.status}")
+        except Exception as e:
+            logger.debug(f"[1xbet] Direct API failed: {e}")
+        return []
+
+    @staticmethod
+    def _is_feed_response(response) -> bool:
+        """True for a successful response from one of the live-odds endpoints."""
+        if response.status != 200:
+            return False
+        # Runs for every response on the page: inline tests beat any()/regex here
+        url = response.url
+        return "LiveFeed" in url or "live-games" in url or "1x2" in url or "odds" in url
+
+    async def _await_feed(self, timeout: float) -> bool:
+        """Return once `_handle_response` has captured a live-feed body (or `timeout` s pass)."""
+        try:
+            await asyncio.wait_for(self._feed_ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
     async def _handle_response(self, response):
         """Capture API responses containing live odds data."""
-        url = response.url
-        # 1xbet serves live data through these patterns
-        if any(pattern in url for pattern in [
-            "LiveFeed", "live-games", "1x2", "odds"
-        ]):
-            try:
-                if response.status == 200:
-                    body = await response.json()
-                    self._api_response = body
-            except Exception:
-                pass
+        # One body per wait: the page keeps polling, and repeats would be parsed for nothing
+        if self._feed_ready.is_set() or not self._is_feed_response(response):
+            return
+        try:
+            self._api_response = _loads(await response.body())
+            self._feed_ready.set()
+        except Exception:
+            pass
 
     def _parse_api_response(self, data: dict) -> List[LiveGame]:
         """Parse 1xbet API JSON response into LiveGame objects."""
@@ -91,6 +186,7 @@ class XBetScraper(BaseScraper):
                     game = self._parse_event(event)
                     if game:
                         games.append(game)
+            self.prune_game_cache(games)
         except Exception as e:
             logger.debug(f"[1xbet] API parse error: {e}")
         return games
@@ -99,12 +195,11 @@ class XBetScraper(BaseScraper):
         """Parse a single event from 1xbet API."""
         try:
             game_id = str(event.get("Id", event.get("id", "")))
-            home = event.get("O1", event.get("homeTeam", {}).get("name", "Unknown"))
-            away = event.get("O2", event.get("awayTeam", {}).get("name", "Unknown"))
+            home = dig(event, ("O1",), ("homeTeam", "name"), default="Unknown")
+            away = dig(event, ("O2",), ("awayTeam", "name"), default="Unknown")
             
-            score = event.get("SC", {})
-            home_score = int(score.get("FS", {}).get("H", 0))
-            away_score = int(score.get("FS", {}).get("G", 0))
+            home_score = int(dig(event, ("SC", "FS", "H"), default=0))
+            away_score = int(dig(event, ("SC", "FS", "G"), default=0))
             minute = int(event.get("LE", 0))
             league = event.get("L", "Unknown League")
             
@@ -112,13 +207,19 @@ class XBetScraper(BaseScraper):
             # 1xbet usually prefixes these or uses specific league names
             league_lower = league.lower()
             if any(term in league_lower for term in ["fifa", "esoccer", "virtual", "cyber", "e-sports"]):
-                logger.debug(f"[1xbet] Skipping non-human game: {home} vs {away} in {league}")
+                logger.debug("[1xbet] Skipping non-human game: %s vs %s in %s", home, away, league)
                 return None
 
             # Extract odds - 1xbet odds structure
             odds = self._extract_odds(event.get("E", []))
 
-            return LiveGame(
+            # Unchanged since last poll: hand back the same object
+            sig = (home_score, away_score, minute, tuple(odds.items()))
+            cached = self.cached_game(f"1xbet_{game_id}", sig)
+            if cached is not None:
+                return cached
+
+            return self.cache_game(LiveGame(
                 game_id=f"1xbet_{game_id}",
                 home_team=home,
                 away_team=away,
@@ -134,43 +235,51 @@ class XBetScraper(BaseScraper):
                 odds_under_25=odds.get("under_25"),
                 odds_btts_yes=odds.get("btts_yes"),
                 bet_url=f"https://1xbet.com/en/line/football/event/{game_id}",
-            )
+            ), sig)
         except Exception as e:
-            logger.debug(f"[1xbet] Event parse error: {e}")
+            logger.debug("[1xbet] Event parse error: %s", e)
             return None
 
+    @staticmethod
+    def _parse_1x2(outcomes: list, odds: dict):
+        # Market type 1 = 1X2 (match result)
+        if len(outcomes) >= 3:
+            odds["home_win"] = outcomes[0].get("C", None)
+            odds["draw"] = outcomes[1].get("C", None)
+            odds["away_win"] = outcomes[2].get("C", None)
+
+    @staticmethod
+    def _parse_totals(outcomes: list, odds: dict):
+        # Market type 17 = Total goals over/under
+        for o in outcomes:
+            name = o.get("N", "").lower()
+            if "2.5" in name:
+                if "over" in name or o.get("T") == OUTCOME_TOTAL_OVER:
+                    odds["over_25"] = o.get("C")
+                else:
+                    odds["under_25"] = o.get("C")
+
+    @staticmethod
+    def _parse_btts(outcomes: list, odds: dict):
+        # Market type 40 = Both teams to score
+        for o in outcomes:
+            name = o.get("N", "").lower()
+            if "yes" in name:
+                odds["btts_yes"] = o.get("C")
+            elif "no" in name:
+                odds["btts_no"] = o.get("C")
+
+    # Market type id -> parser; every other market (most of an event's 100+) is skipped
+    _MARKET_HANDLERS = {MARKET_1X2: _parse_1x2, MARKET_TOTALS: _parse_totals, MARKET_BTTS: _parse_btts}
+
     def _extract_odds(self, markets: list) -> dict:
         """Extract standard odds from 1xbet market structure."""
         odds = {}
+        handlers = self._MARKET_HANDLERS
         for market in markets:
-            market_id = market.get("T", 0)
-            outcomes = market.get("E", [])
-            
-            # Market type 1 = 1X2 (match result)
-            if market_id == 1 and len(outcomes) >= 3:
-                odds["home_win"] = outcomes[0].get("C", None)
-                odds["draw"] = outcomes[1].get("C", None)
-                odds["away_win"] = outcomes[2].get("C", None)
-            
-            # Market type 17 = Total goals over/under
-            elif market_id == 17:
-                for o in outcomes:
-                    name = o.get("N", "").lower()
-                    if "2.5" in name:
-                        if "over" in name or o.get("T") == 1:
-                            odds["over_25"] = o.get("C")
-                        else:
-                            odds["under_25"] = o.get("C")
-            
-            # BTTS
-            elif market_id == 40:
-                for o in outcomes:
-                    name = o.get("N", "").lower()
-                    if "yes" in name:
-                        odds["btts_yes"] = o.get("C")
-                    elif "no" in name:
-                        odds["btts_no"] = o.get("C")
-        
+            handler = handlers.get(market.get("T", 0))
+            if handler is not None:
+                handler(market.get("E", []), odds)
         return odds
 
     async def _scrape_dom(self) -> List[LiveGame]:
@@ -180,43 +289,35 @@ class XBetScraper(BaseScraper):
             # Wait for game rows
             await self.page.wait_for_selector(".liveLine__game, [class*='live-game']", timeout=8000)
             
-            game_elements = await self.page.query_selector_all(
-                ".liveLine__game, .live-event-row, [data-live-game]"
-            )
+            # One evaluate instead of ~6 CDP round trips per row
+            rows = await self.page.evaluate(_DOM_ROWS_JS)
 
-            for el in game_elements[:20]:  # Limit to 20 games
+            for row in rows:  # Already limited to 20 games
                 try:
-                    home = await el.query_selector(".liveLine__teamName:first-child, .team-home")
-                    away = await el.query_selector(".liveLine__teamName:last-child, .team-away")
-                    score_el = await el.query_selector(".liveLine__score, .score")
-                    minute_el = await el.query_selector(".liveLine__time, .game-time")
-
-                    if not all([home, away]):
+                    if row["home"] is None or row["away"] is None:
                         continue
 
-                    home_name = (await home.inner_text()).strip()
-                    away_name = (await away.inner_text()).strip()
-                    score_text = (await score_el.inner_text()).strip() if score_el else "0:0"
-                    minute_text = (await minute_el.inner_text()).strip() if minute_el else "0"
+                    home_name = row["home"].strip()
+                    away_name = row["away"].strip()
+                    score_text = row["score"].strip() if row["score"] is not None else "0:0"
+                    minute_text = row["minute"].strip() if row["minute"] is not None else "0"
 
                     # Parse score
-                    parts = re.split(r"[-:]", score_text)
+                    parts = _SCORE_SEP_RE.split(score_text)
                     hs = int(parts[0]) if parts else 0
                     as_ = int(parts[1]) if len(parts) > 1 else 0
-                    minute = int(re.sub(r"\D", "", minute_text) or 0)
+                    minute = int(_NON_DIGIT_RE.sub("", minute_text) or 0)
 
                     # Odds from buttons
-                    odd_buttons = await el.query_selector_all(".odd, .coefficient, [class*='odds']")
                     odds_vals = []
-                    for btn in odd_buttons[:5]:
-                        txt = (await btn.inner_text()).strip()
+                    for txt in row["odds"]:
                         try:
-                            odds_vals.append(float(txt))
+                            odds_vals.append(float(txt.strip()))
                         except ValueError:
                             pass
 
                     game = LiveGame(
-                        game_id=f"1xbet_dom_{hash(home_name + away_name)}",
+                        game_id=dom_game_id("1xbet_dom", home_name, away_name),
                         home_team=home_name,
                         away_team=away_name,
                         home_score=hs,
@@ -231,7 +332,7 @@ class XBetScraper(BaseScraper):
                     games.append(game)
 
                 except Exception as e:
-                    logger.debug(f"[1xbet] Row parse error: {e}")
+                    logger.debug("[1xbet] Row parse error: %s", e)
 
         except Exception as e:
             logger.warning(f"[1xbet] DOM scraping failed: {e}")
@@ -243,9 +344,8 @@ class XBetScraper(BaseScraper):
         try:
             logger.info(f"[1xbet] Placing {bet_type} bet on {game.home_team} vs {game.away_team}, stake: {stake}")
 
-            # Navigate to game
+            # Navigate to game; click() below waits for the odds button to render
             await self.safe_goto(game.bet_url)
-            await self.page.wait_for_timeout(2000)
 
             # Map bet_type to button selector
             bet_selectors = {
@@ -268,8 +368,7 @@ class XBetScraper(BaseScraper):
             # Enter stake amount
             stake_input = await self.page.query_selector("input.betslip__stake, [placeholder*='stake'], [name*='amount']")
             if stake_input:
-                await stake_input.triple_click()
-                await stake_input.type(str(int(stake)))
+                await self.enter_stake(stake_input, stake)
                 await self.page.wait_for_timeout(500)
 
             # Click Place Bet button
@@ -338,7 +437,7 @@ class XBetScraper(BaseScraper):
             if balance_el:
                 text = (await balance_el.inner_text()).strip()
                 # Remove currency symbols and formatting
-                val = float(re.sub(r"[^\d.]", "", text.replace(",", "")))
+                val = float(_NON_AMOUNT_RE.sub("", text.replace(",", "")))
                 return val
         except Exception as e:
             logger.error(f"[1xbet] Failed to get balance: {e}")
@@ -358,7 +457,7 @@ class XBetScraper(BaseScraper):
             balance_el = await self.page.query_selector(".user-info__balance, [class*='balance-amount']")
             if balance_el:
                 text = (await balance_el.inner_text()).strip()
-                return float(re.sub(r"[^\d.]", "", text))
+                return float(_NON_AMOUNT_RE.sub("", text))
         except Exception:
             pass
         return 0.0
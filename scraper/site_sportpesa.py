@@ -11,17 +11,56 @@ import json
 import logging
 import re
 from typing import List
-from .base_scraper import BaseScraper, LiveGame
+from .base_scraper import BaseScraper, LiveGame, dig, dom_game_id
 import config
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Feed bodies are parsed straight from bytes
+_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Precompiled: these run per field, per row, every poll
+_SCORE_SEP_RE = re.compile(r"[-:]")
+_NON_DIGIT_RE = re.compile(r"\D")
+_NON_AMOUNT_RE = re.compile(r"[^\d.]")
+
+# Market-name classifiers, tried in this order
+_RESULT_MARKET_RE = re.compile(r"match result|1x2|moneyline")
+_TOTALS_MARKET_RE = re.compile(r"over|under|total")
+_BTTS_MARKET_RE = re.compile(r"both teams|btts|gg")
+
+# Only API calls carry live data; documents, scripts and the like never do
+_API_RESOURCE_TYPES = frozenset(("xhr", "fetch"))
+
+
+# A DOM row's team, score and time texts (null = element missing)
+_ROW_TEXTS_JS = """
+el => {
+    const text = sel => {
+        const found = el.querySelector(sel);
+        return found ? found.innerText : null;
+    };
+    return {
+        teams: Array.from(el.querySelectorAll(".team-name, .participant")).slice(0, 2).map(t => t.innerText),
+        score: text(".score, .result"),
+        time: text(".time, .minute, .elapsed"),
+    };
+}
+"""
+
 
 class SportPesaScraper(BaseScraper):
 
     def __init__(self):
         super().__init__("sportpesa", config.SITE_URLS["sportpesa"])
         self._live_data = None
+        self._live_ready = asyncio.Event()  # Set once a live-data body is captured
 
     async def get_live_games(self) -> List[LiveGame]:
         games = []
@@ -34,15 +73,9 @@ class SportPesaScraper(BaseScraper):
             games = await self._fetch_via_api(api_url)
 
             if not games:
-                # Fallback: browser-based scraping
-                self.page.on("response", self._handle_response)
-                await self.safe_goto(self.url)
-                await self.page.wait_for_timeout(5000)
-
-                if self._live_data:
-                    games = self._parse_live_data(self._live_data)
-                else:
-                    games = await self._scrape_dom()
+                # Fallback: browser-based scraping, once a page slot is free
+                async with self.page_slots:
+                    games = await self._scrape_page()
 
             logger.info(f"[SportPesa] Found {len(games)} live games")
 
@@ -51,6 +84,27 @@ class SportPesaScraper(BaseScraper):
 
         return games
 
+    async def _scrape_page(self) -> List[LiveGame]:
+        """Load the live page and take odds from its API responses, else from the DOM."""
+        self._live_data = None
+        self._live_ready.clear()
+        # Listen only while scraping: the live page keeps polling its API in between
+        self.page.on("response", self._handle_response)
+        try:
+            await self.safe_goto(self.url)
+            # Proceed on the first live-data body rather than a fixed 5s sleep;
+            # the listener stays attached until one is captured or the wait runs out
+            await self._await_live_data(timeout=8.0)
+        finally:
+            self.page.remove_listener("response", self._handle_response)
+
+        if self._live_data:
+            # Take the payload rather than keep it alive until the next poll
+            data, self._live_data = self._live_data, None
+            # Parse off the event loop so other sites keep scraping meanwhile
+            return await asyncio.to_thread(self._parse_live_data, data)
+        return await self._scrape_dom()
+
     async def _fetch_via_api(self, api_url: str) -> List[LiveGame]:
         """Try to fetch directly from SportPesa's internal API."""
         try:
@@ -60,26 +114,48 @@ class SportPesaScraper(BaseScraper):
                 "Accept": "application/json",
                 "Referer": "https://www.sportpesa.com/",
             }
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        return self._parse_live_data(data)
+            # Reused session: no TCP/TLS handshake on every poll
+            session = await self.get_session()
+            async with session.get(api_url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                if resp.status == 200:
+                    data = _loads(await resp.read())
+                    return await asyncio.to_thread(self._parse_live_data, data)
         except Exception as e:
             logger.debug(f"[SportPesa] Direct API failed: {e}")
         return []
 
+    @staticmethod
+    def _is_live_response(response) -> bool:
+        """True for a successful JSON XHR/fetch response from one of the live-odds API calls."""
+        # The page's own document (".../games/live") matches the URL tests too
+        if response.status != 200 or response.request.resource_type not in _API_RESOURCE_TYPES:
+            return False
+        if "json" not in response.headers.get("content-type", ""):
+            return False
+        # Runs for every response on the page: inline tests beat any()/regex here
+        url = response.url
+        return "live" in url or "events" in url or "odds" in url or "api/v" in url
+
+    async def _await_live_data(self, timeout: float) -> bool:
+        """Return once `_handle_response` has captured a live-data body (or `timeout` s pass)."""
+        try:
+            await asyncio.wait_for(self._live_ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
     async def _handle_response(self, response):
         """Intercept SportPesa API responses."""
-        url = response.url
-        if any(p in url for p in ["live", "events", "odds", "api/v"]):
-            try:
-                if response.status == 200:
-                    body = await response.json()
-                    if isinstance(body, (list, dict)) and body:
-                        self._live_data = body
-            except Exception:
-                pass
+        # One body per scrape: later polls of the same API would be parsed for nothing
+        if self._live_ready.is_set() or not self._is_live_response(response):
+            return
+        try:
+            body = _loads(await response.body())
+            if isinstance(body, (list, dict)) and body:
+                self._live_data = body
+                self._live_ready.set()
+        except Exception:
+            pass
 
     def _parse_live_data(self, data) -> List[LiveGame]:
         """Parse SportPesa API response."""
@@ -92,6 +168,7 @@ class SportPesaScraper(BaseScraper):
                 game = self._parse_event(event)
                 if game:
                     games.append(game)
+            self.prune_game_cache(games)
         except Exception as e:
             logger.debug(f"[SportPesa] Parse error: {e}")
         return games
@@ -102,8 +179,8 @@ class SportPesaScraper(BaseScraper):
             game_id = str(event.get("id", event.get("eventId", "")))
             
             # Team names
-            home = event.get("homeName", event.get("home_team", {}).get("name", ""))
-            away = event.get("awayName", event.get("away_team", {}).get("name", ""))
+            home = dig(event, ("homeName",), ("home_team", "name"), default="")
+            away = dig(event, ("awayName",), ("away_team", "name"), default="")
             
             if not home or not away:
                 return None
@@ -112,13 +189,19 @@ class SportPesaScraper(BaseScraper):
             home_score = int(event.get("homeScore", event.get("home_score", 0)) or 0)
             away_score = int(event.get("awayScore", event.get("away_score", 0)) or 0)
             minute = int(event.get("minute", event.get("elapsed", 0)) or 0)
-            league = event.get("competitionName", event.get("competition", {}).get("name", "Unknown"))
+            league = dig(event, ("competitionName",), ("competition", "name"), default="Unknown")
 
             # Odds parsing - SportPesa structure
             markets = event.get("markets", event.get("odds", []))
             odds = self._parse_markets(markets)
 
-            return LiveGame(
+            # Unchanged since last poll: hand back the same object
+            sig = (home_score, away_score, minute, tuple(odds.items()))
+            cached = self.cached_game(f"sportpesa_{game_id}", sig)
+            if cached is not None:
+                return cached
+
+            return self.cache_game(LiveGame(
                 game_id=f"sportpesa_{game_id}",
                 home_team=home,
                 away_team=away,
@@ -134,11 +217,50 @@ class SportPesaScraper(BaseScraper):
                 odds_under_25=odds.get("under_25"),
                 odds_btts_yes=odds.get("btts_yes"),
                 bet_url=f"https://www.sportpesa.com/games/live/{game_id}",
-            )
+            ), sig)
         except Exception as e:
-            logger.debug(f"[SportPesa] Event parse error: {e}")
+            logger.debug("[SportPesa] Event parse error: %s", e)
             return None
 
+    @staticmethod
+    def _parse_result(picks: list, odds: dict):
+        for pick in picks:
+            label = pick.get("label", pick.get("name", "")).upper()
+            val = float(pick.get("odds", pick.get("value", 0)) or 0)
+            if "1" == label or "HOME" in label:
+                odds["home"] = val
+            elif "X" == label or "DRAW" in label:
+                odds["draw"] = val
+            elif "2" == label or "AWAY" in label:
+                odds["away"] = val
+
+    @staticmethod
+    def _parse_totals(picks: list, odds: dict):
+        for pick in picks:
+            label = pick.get("label", pick.get("name", "")).lower()
+            val = float(pick.get("odds", pick.get("value", 0)) or 0)
+            if "over" in label and "2.5" in label:
+                odds["over_25"] = val
+            elif "under" in label and "2.5" in label:
+                odds["under_25"] = val
+
+    @staticmethod
+    def _parse_btts(picks: list, odds: dict):
+        for pick in picks:
+            label = pick.get("label", pick.get("name", "")).lower()
+            val = float(pick.get("odds", pick.get("value", 0)) or 0)
+            if "yes" in label or "gg" == label:
+                odds["btts_yes"] = val
+            elif "no" in label or "ng" == label:
+                odds["btts_no"] = val
+
+    # (market-name pattern, parser); the first pattern that matches wins
+    _MARKET_HANDLERS = (
+        (_RESULT_MARKET_RE, _parse_result),
+        (_TOTALS_MARKET_RE, _parse_totals),
+        (_BTTS_MARKET_RE, _parse_btts),
+    )
+
     def _parse_markets(self, markets) -> dict:
         """Extract odds from SportPesa market structure."""
         odds = {}
@@ -146,36 +268,10 @@ class SportPesaScraper(BaseScraper):
         if isinstance(markets, list):
             for market in markets:
                 name = market.get("name", market.get("marketName", "")).lower()
-                picks = market.get("picks", market.get("outcomes", []))
-                
-                if "match result" in name or "1x2" in name or "moneyline" in name:
-                    for pick in picks:
-                        label = pick.get("label", pick.get("name", "")).upper()
-                        val = float(pick.get("odds", pick.get("value", 0)) or 0)
-                        if "1" == label or "HOME" in label:
-                            odds["home"] = val
-                        elif "X" == label or "DRAW" in label:
-                            odds["draw"] = val
-                        elif "2" == label or "AWAY" in label:
-                            odds["away"] = val
-                
-                elif "over" in name or "under" in name or "total" in name:
-                    for pick in picks:
-                        label = pick.get("label", pick.get("name", "")).lower()
-                        val = float(pick.get("odds", pick.get("value", 0)) or 0)
-                        if "over" in label and "2.5" in label:
-                            odds["over_25"] = val
-                        elif "under" in label and "2.5" in label:
-                            odds["under_25"] = val
-                
-                elif "both teams" in name or "btts" in name or "gg" in name:
-                    for pick in picks:
-                        label = pick.get("label", pick.get("name", "")).lower()
-                        val = float(pick.get("odds", pick.get("value", 0)) or 0)
-                        if "yes" in label or "gg" == label:
-                            odds["btts_yes"] = val
-                        elif "no" in label or "ng" == label:
-                            odds["btts_no"] = val
+                for pattern, handler in self._MARKET_HANDLERS:
+                    if pattern.search(name):
+                        handler(market.get("picks", market.get("outcomes", [])), odds)
+                        break
 
         return odds
 
@@ -188,32 +284,36 @@ class SportPesaScraper(BaseScraper):
 
             for row in rows[:20]:
                 try:
-                    teams = await row.query_selector_all(".team-name, .participant")
+                    # Teams, score and time in one round trip
+                    info = await row.evaluate(_ROW_TEXTS_JS)
+                    teams = info["teams"]
                     if len(teams) < 2:
                         continue
-                    home_name = (await teams[0].inner_text()).strip()
-                    away_name = (await teams[1].inner_text()).strip()
+                    home_name = teams[0].strip()
+                    away_name = teams[1].strip()
 
-                    score_el = await row.query_selector(".score, .result")
-                    score_text = (await score_el.inner_text()).strip() if score_el else "0-0"
-                    parts = re.split(r"[-:]", score_text)
+                    score_text = info["score"].strip() if info["score"] is not None else "0-0"
+                    parts = _SCORE_SEP_RE.split(score_text)
                     hs = int(parts[0]) if parts else 0
                     as_ = int(parts[1]) if len(parts) > 1 else 0
 
-                    time_el = await row.query_selector(".time, .minute, .elapsed")
-                    minute_text = (await time_el.inner_text()).strip() if time_el else "0"
-                    minute = int(re.sub(r"\D", "", minute_text) or 0)
+                    minute_text = info["time"].strip() if info["time"] is not None else "0"
+                    minute = int(_NON_DIGIT_RE.sub("", minute_text) or 0)
 
-                    odd_els = await row.query_selector_all(".odd-value, .odds button, .pick-value")
+                    # All odds texts in one round trip instead of one per button
+                    odd_texts = await row.eval_on_selector_all(
+                        ".odd-value, .odds button, .pick-value",
+                        "els => els.slice(0, 5).map(e => e.innerText)",
+                    )
                     odd_vals = []
-                    for o in odd_els[:5]:
+                    for txt in odd_texts:
                         try:
-                            odd_vals.append(float((await o.inner_text()).strip()))
+                            odd_vals.append(float(txt.strip()))
                         except ValueError:
                             pass
 
                     games.append(LiveGame(
-                        game_id=f"sp_dom_{hash(home_name + away_name)}",
+                        game_id=dom_game_id("sp_dom", home_name, away_name),
                         home_team=home_name,
                         away_team=away_name,
                         home_score=hs,
@@ -234,8 +334,8 @@ class SportPesaScraper(BaseScraper):
     async def place_bet(self, game: LiveGame, bet_type: str, stake: float) -> bool:
         """Place bet on SportPesa."""
         try:
+            # click() below waits for the pick to render, no fixed sleep needed
             await self.safe_goto(game.bet_url)
-            await self.page.wait_for_timeout(2000)
 
             bet_map = {
                 "home": "[data-outcome='1'], .market-pick:nth-child(1)",
@@ -254,8 +354,7 @@ class SportPesaScraper(BaseScraper):
 
             stake_el = await self.page.query_selector("input.betslip-input, input[placeholder*='amount'], input[name*='stake']")
             if stake_el:
-                await stake_el.triple_click()
-                await stake_el.type(str(int(stake)))
+                await self.enter_stake(stake_el, stake)
 
             place_el = await self.page.query_selector("button.place-bet, button:has-text('Place Bet'), .confirm-bet")
             if place_el:
@@ -278,14 +377,15 @@ class SportPesaScraper(BaseScraper):
             await self.page.fill("input[name='username'], input[type='tel']", creds["username"])
             await self.page.fill("input[name='password']", creds["password"])
             await self.page.click("button[type='submit']")
-            await self.page.wait_for_timeout(3000)
-            
-            if await self.page.query_selector(".user-balance, .logout-btn"):
+
+            # Returns as soon as the logged-in header renders
+            try:
+                await self.page.wait_for_selector(".user-balance, .logout-btn", timeout=3000)
                 self.status = ScraperStatus.LOGGED_IN
                 return True
-            
-            self.status = ScraperStatus.ERROR
-            return False
+            except Exception:
+                self.status = ScraperStatus.ERROR
+                return False
         except Exception as e:
             logger.error(f"[SportPesa] Login error: {e}")
             self.status = ScraperStatus.ERROR
@@ -300,7 +400,7 @@ class SportPesaScraper(BaseScraper):
             el = await self.page.query_selector(".user-balance, [class*='balance']")
             if el:
                 text = (await el.inner_text()).strip()
-                return float(re.sub(r"[^\d.]", "", text))
+                return float(_NON_AMOUNT_RE.sub("", text))
         except Exception:
             pass
         return 0.0
@@ -29,6 +29,8 @@ import config
 
 logger = logging.getLogger(__name__)
 
+_NON_AMOUNT_RE = re.compile(r"[^\d.]")
+
 
 class YOURSITEScraper(BaseScraper):
 
@@ -113,7 +115,7 @@ class YOURSITEScraper(BaseScraper):
             el = await self.page.query_selector(".balance-display")
             if el:
                 text = (await el.inner_text()).strip()
-                return float(re.sub(r"[^\d.]", "", text))
+                return float(_NON_AMOUNT_RE.sub("", text))
         except Exception:
             pass
         return 0.0
@@ -0,0 +1,15 @@
+"""
+scraper/xbet_markets.py
+1xbet feed ids shared by the scrapers that parse its live feed
+
+Markets are events' "E" entries, keyed by their "T" field; each market's
+outcomes carry their own "T" too. Only ids the parsers rely on live here.
+"""
+
+# Market type ids (the "T" field on a market)
+MARKET_1X2 = 1
+MARKET_TOTALS = 17
+MARKET_BTTS = 40
+
+# Outcome type id (the "T" field on a totals outcome) for "over"
+OUTCOME_TOTAL_OVER = 1
@@ -1,21 +1,44 @@
-import requests
+import asyncio
 import json
 import time
 
-url = "http://localhost:11434/api/generate"
+import aiohttp
+
+import config
+
+url = f"{config.OLLAMA_URL}/api/generate"
 payload = {
-    "model": "llama3",
+    "model": config.OLLAMA_MODEL,
     "prompt": "Say hello in JSON format like {'message': 'hello'}",
-    "stream": False,
+    "stream": True,  # First streamed chunk proves the model is up, no need to wait for the full answer
     "format": "json"
 }
+PROBES = 3
+
+
+async def probe(session: aiohttp.ClientSession) -> float:
+    """Seconds until Ollama streams its first chunk."""
+    start = time.time()
+    async with session.post(url, json=payload) as res:
+        print(f"Status: {res.status}")
+        async for line in res.content:
+            if line.strip():
+                print(f"First chunk: {json.loads(line).get('response', '')!r}")
+                break
+    return time.time() - start
 
-start = time.time()
-try:
+
+async def main():
     print(f"Testing Ollama at {url}...")
-    res = requests.post(url, json=payload, timeout=5)
-    print(f"Status: {res.status_code}")
-    print(f"Response: {res.text}")
-    print(f"Time: {time.time() - start:.2f}s")
-except Exception as e:
-    print(f"Failed: {e}")
+    # One session for every probe: later probes reuse the keepalive connection
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
+        for i in range(PROBES):
+            try:
+                print(f"Probe {i + 1} time to first chunk: {await probe(session):.2f}s")
+            except Exception as e:
+                print(f"Failed: {e}")
+                break
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -10,13 +10,17 @@ Layout:
 """
 
 import customtkinter as ctk
-from tkinter import ttk, messagebox
+from tkinter import ttk
 import tkinter as tk
 import asyncio
+import heapq
+import inspect
 import threading
 import logging
 from datetime import datetime
-from typing import List, Dict, Optional
+from functools import lru_cache
+from itertools import chain
+from typing import Any, List, Dict, Optional
 import config
 
 logger = logging.getLogger(__name__)
@@ -40,6 +44,73 @@ COLORS = {
     "conf_low": "#f85149",        # Red
 }
 
+SITE_COLORS = {
+    "1xbet": COLORS["blue"],
+    "sportpesa": COLORS["orange"],
+}
+
+# Indexed by BetRecommendation.confidence_tier (Low, Medium, High, Very High)
+CONF_COLORS = (
+    COLORS["conf_low"],
+    COLORS["conf_medium"],
+    COLORS["conf_high"],
+    COLORS["conf_very_high"],
+)
+
+# Recommendations list geometry: every card occupies one fixed-height row
+REC_ROW_HEIGHT = 180
+REC_CARD_GAP = 8
+
+
+@lru_cache(maxsize=256)
+def _history_row(
+    timestamp: str, auto: str, match: str, bet: str,
+    odds: float, stake: float, confidence: float, status: str, pnl: Optional[float],
+) -> tuple:
+    """Treeview values for one bet; unchanged bets hit the cache on every refresh."""
+    pnl_str = f"+{pnl:.0f}" if pnl and pnl > 0 else (f"{pnl:.0f}" if pnl else "-")
+    return (
+        timestamp[:16].replace("T", " "),
+        auto,
+        match[:30],
+        bet,
+        f"{odds:.2f}",
+        f"{stake:.0f}",
+        f"{confidence:.0f}%",
+        status.upper(),
+        pnl_str,
+    )
+
+
+def _wheel_scroll(canvas: tk.Canvas, event):
+    """Scroll `canvas` for a mouse-wheel event over it or any widget embedded in it."""
+    if not str(event.widget).startswith(str(canvas)):
+        return
+    step = -1 if event.num == 4 or event.delta > 0 else 1
+    canvas.yview_scroll(step * 3, "units")
+
+
+class FastScrollFrame(tk.Frame):
+    """
+    Scrollable container: a plain tk.Canvas with one embedded frame (`inner`).
+    Unlike CTkScrollableFrame there are no rounded decorations to repaint on scroll.
+    """
+
+    def __init__(self, master, bg: str, **kwargs):
+        super().__init__(master, bg=bg, **kwargs)
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0, yscrollincrement=20)
+        scrollbar = ctk.CTkScrollbar(self, command=self.canvas.yview, button_color=COLORS["border"])
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.inner = tk.Frame(self.canvas, bg=bg)
+        window = self.canvas.create_window((0, 0), window=self.inner, anchor="nw")
+        self.inner.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        self.canvas.bind("<Configure>", lambda e: self.canvas.itemconfigure(window, width=e.width))
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.bind_all(seq, lambda e: _wheel_scroll(self.canvas, e), add="+")
+
 
 class SoccerBotDashboard:
 
@@ -52,21 +123,74 @@ class SoccerBotDashboard:
         self.root.geometry("1400x900")
         self.root.configure(fg_color=COLORS["bg"])
 
+        # Shared fonts: built once, referenced by every widget
+        self.F = {
+            "xs": ctk.CTkFont(size=9),
+            "xs_bold": ctk.CTkFont(size=9, weight="bold"),
+            "sm": ctk.CTkFont(size=10),
+            "sm_bold": ctk.CTkFont(size=10, weight="bold"),
+            "base": ctk.CTkFont(size=11),
+            "base_bold": ctk.CTkFont(size=11, weight="bold"),
+            "md": ctk.CTkFont(size=12),
+            "md_bold": ctk.CTkFont(size=12, weight="bold"),
+            "lg": ctk.CTkFont(size=13),
+            "lg_bold": ctk.CTkFont(size=13, weight="bold"),
+            "mono_hdr": ctk.CTkFont(family="Courier New", size=13, weight="bold"),
+            "mono_logo": ctk.CTkFont(family="Courier New", size=20, weight="bold"),
+        }
+
         # State
         self._games = []
         self._recommendations = {}
+        self._history_bets = []
+        self._history_len = 0
         self._auto_bet_var = tk.BooleanVar(value=False)
         self._status_var = tk.StringVar(value="● Initializing...")
         self._balance_var = tk.StringVar(value="Balance: —")
         self._pnl_var = tk.StringVar(value="P&L: —")
         self._last_refresh = tk.StringVar(value="Last refresh: —")
 
-        # Callbacks (set by main.py)
+        # Live card widgets, reused across refreshes
+        self._game_widgets: Dict[str, Dict[str, Any]] = {}   # game_id -> widgets
+        self._rec_pool: List[Dict[str, Any]] = []             # recycled recommendation cards
+        self._top_recs: list = []                             # top 20 recommendations by confidence
+        self._visible_recs: list = []                         # what the recs panel currently shows
+        self._rec_display: Dict[int, Dict[str, Any]] = {}     # id(rec) -> formatted strings
+        self._games_order: List[str] = []
+        self._placeholders: Dict[str, ctk.CTkLabel] = {}
+
+        # History rows already in the table: (timestamp, match, bet) -> iid -> values
+        self._history_iids: Dict[tuple, str] = {}
+        self._history_values: Dict[str, tuple] = {}
+        self._history_order: List[tuple] = []
+        self._history_tree: Optional[ttk.Treeview] = None  # built on first history update
+
+        # Content signatures of the last data handed to each panel
+        self._last_games_sig: Optional[tuple] = None
+        self._last_recs_sig: Optional[tuple] = None
+        self._last_history_sig: Optional[tuple] = None
+
+        self._pending_stats: Optional[dict] = None  # latest stats awaiting the idle callback
+
+        # Debounced rendering: panels marked dirty since the last flush
+        self._pending: set = set()
+        self._render_scheduled = False
+        self._render_deferred = False  # set while the window is minimized/hidden
+
+        # Callbacks (set by main.py); plain functions or coroutine functions
         self.on_manual_bet = None      # fn(rec)
         self.on_auto_bet_toggle = None # fn(enabled: bool)
         self.on_force_refresh = None   # fn()
 
+        # Confirmation dialog, built on first use and then shown/hidden
+        self._confirm_dlg: Optional[ctk.CTkToplevel] = None
+
+        # Callbacks run on this loop in a worker thread, so mainloop never waits on them
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="dashboard-loop", daemon=True).start()
+
         self._build_ui()
+        self.root.bind("<Map>", self._on_map, add="+")
 
     def _build_ui(self):
         """Build the complete UI layout."""
@@ -84,7 +208,7 @@ class SoccerBotDashboard:
         # Logo
         logo = ctk.CTkLabel(
             header, text="⚽ SOCCERBOT",
-            font=ctk.CTkFont(family="Courier New", size=20, weight="bold"),
+            font=self.F["mono_logo"],
             text_color=COLORS["green"]
         )
         logo.pack(side="left", padx=20)
@@ -92,7 +216,7 @@ class SoccerBotDashboard:
         # Status indicator
         status_label = ctk.CTkLabel(
             header, textvariable=self._status_var,
-            font=ctk.CTkFont(size=12),
+            font=self.F["md"],
             text_color=COLORS["text_muted"]
         )
         status_label.pack(side="left", padx=15)
@@ -104,7 +228,7 @@ class SoccerBotDashboard:
         # P&L
         pnl_label = ctk.CTkLabel(
             right_frame, textvariable=self._pnl_var,
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=self.F["md_bold"],
             text_color=COLORS["green"]
         )
         pnl_label.pack(side="right", padx=15)
@@ -112,7 +236,7 @@ class SoccerBotDashboard:
         # Balance
         balance_label = ctk.CTkLabel(
             right_frame, textvariable=self._balance_var,
-            font=ctk.CTkFont(size=12),
+            font=self.F["md"],
             text_color=COLORS["text"]
         )
         balance_label.pack(side="right", padx=10)
@@ -123,7 +247,7 @@ class SoccerBotDashboard:
 
         ctk.CTkLabel(
             auto_frame, text="AUTO-BET",
-            font=ctk.CTkFont(size=10, weight="bold"),
+            font=self.F["sm_bold"],
             text_color=COLORS["text_muted"]
         ).pack(side="left")
 
@@ -148,13 +272,13 @@ class SoccerBotDashboard:
             border_width=1,
             text_color=COLORS["text"],
             hover_color=COLORS["border"],
-            font=ctk.CTkFont(size=12),
+            font=self.F["md"],
         ).pack(side="right", padx=5)
 
         # Last refresh
         ctk.CTkLabel(
             right_frame, textvariable=self._last_refresh,
-            font=ctk.CTkFont(size=10),
+            font=self.F["sm"],
             text_color=COLORS["text_muted"]
         ).pack(side="right", padx=10)
 
@@ -170,14 +294,12 @@ class SoccerBotDashboard:
 
         ctk.CTkLabel(
             left, text="📺 LIVE GAMES",
-            font=ctk.CTkFont(family="Courier New", size=13, weight="bold"),
+            font=self.F["mono_hdr"],
             text_color=COLORS["blue"]
         ).pack(padx=15, pady=(12, 5), anchor="w")
 
         # Games scrollable frame
-        self._games_scroll = ctk.CTkScrollableFrame(
-            left, fg_color="transparent", scrollbar_button_color=COLORS["border"]
-        )
+        self._games_scroll = FastScrollFrame(left, bg=COLORS["surface"])
         self._games_scroll.pack(fill="both", expand=True, padx=5, pady=5)
 
         # Right: Recommendations
@@ -186,18 +308,35 @@ class SoccerBotDashboard:
 
         ctk.CTkLabel(
             right, text="🎯 BET RECOMMENDATIONS",
-            font=ctk.CTkFont(family="Courier New", size=13, weight="bold"),
+            font=self.F["mono_hdr"],
             text_color=COLORS["green"]
         ).pack(padx=15, pady=(12, 5), anchor="w")
 
-        self._recs_scroll = ctk.CTkScrollableFrame(
-            right, fg_color="transparent", scrollbar_button_color=COLORS["border"]
+        # Virtualized list: a small pool of cards is moved over the visible rows
+        self._recs_scrollbar = ctk.CTkScrollbar(right, button_color=COLORS["border"])
+        self._recs_scrollbar.pack(side="right", fill="y", padx=(0, 5), pady=5)
+
+        self._recs_canvas = ctk.CTkCanvas(
+            right, bg=COLORS["surface"], highlightthickness=0, yscrollincrement=20,
+            yscrollcommand=self._on_recs_scrolled,
+        )
+        self._recs_canvas.pack(side="left", fill="both", expand=True, padx=5, pady=5)
+        self._recs_scrollbar.configure(command=self._recs_canvas.yview)
+        self._recs_canvas.bind("<Configure>", lambda e: self._layout_recs())
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self._recs_canvas.bind_all(seq, lambda e: _wheel_scroll(self._recs_canvas, e), add="+")
+
+        self._recs_empty = self._recs_canvas.create_text(
+            20, 40, anchor="nw",
+            text="No betting opportunities found.\n\nWaiting for analysis...",
+            fill=COLORS["text_muted"], font=self.F["lg"],
         )
-        self._recs_scroll.pack(fill="both", expand=True, padx=5, pady=5)
 
     def _build_history_panel(self):
-        """Bottom panel: bet history table."""
-        history_frame = ctk.CTkFrame(self.root, fg_color=COLORS["surface"], height=220, corner_radius=8)
+        """Bottom panel: header only; the table is built by _build_history_tree on first use."""
+        self._history_frame = history_frame = ctk.CTkFrame(
+            self.root, fg_color=COLORS["surface"], height=220, corner_radius=8
+        )
         history_frame.pack(fill="x", padx=10, pady=(0, 5))
         history_frame.pack_propagate(False)
 
@@ -206,11 +345,14 @@ class SoccerBotDashboard:
 
         ctk.CTkLabel(
             header_row, text="📋 BET HISTORY",
-            font=ctk.CTkFont(family="Courier New", size=13, weight="bold"),
+            font=self.F["mono_hdr"],
             text_color=COLORS["purple"]
         ).pack(side="left")
 
-        # History treeview
+    def _build_history_tree(self):
+        """Style and create the history treeview inside the history panel."""
+        history_frame = self._history_frame
+
         style = ttk.Style()
         style.theme_use("clam")
         style.configure("History.Treeview",
@@ -256,7 +398,7 @@ class SoccerBotDashboard:
             status_bar,
             text="⚠️  For educational purposes only. Bet responsibly.  |  "
                  "Auto-bet requires valid login credentials in config.py",
-            font=ctk.CTkFont(size=10),
+            font=self.F["sm"],
             text_color=COLORS["text_muted"]
         ).pack(side="left", padx=10)
 
@@ -264,7 +406,7 @@ class SoccerBotDashboard:
             status_bar,
             text=f"v1.0 | Refresh: {config.REFRESH_INTERVAL}s | "
                  f"Min Confidence: {config.MIN_DISPLAY_CONFIDENCE}%",
-            font=ctk.CTkFont(size=10),
+            font=self.F["sm"],
             text_color=COLORS["text_muted"]
         ).pack(side="right", padx=10)
 
@@ -273,317 +415,485 @@ class SoccerBotDashboard:
     # ─────────────────────────────────────────────
 
     def update_games(self, games: list):
-        """Refresh the games panel."""
+        """Refresh the games panel (no-op when nothing displayed has changed)."""
+        sig = tuple((g.game_id, g.home_score, g.away_score, g.minute) for g in games)
+        if sig == self._last_games_sig:
+            return
+        self._last_games_sig = sig
         self._games = games
-        self.root.after(0, self._render_games)
+        self._schedule_render("games")
 
     def update_recommendations(self, recs: dict):
-        """Refresh the recommendations panel."""
+        """Refresh the recommendations panel (no-op when nothing displayed has changed)."""
+        sig = tuple(
+            (r.game.game_id, r.bet_label, round(r.confidence, 1), round(r.odds, 2),
+             r.game.home_score, r.game.away_score, r.game.minute)
+            for game_recs in recs.values() for r in game_recs
+        )
+        if sig == self._last_recs_sig:
+            return
+        self._last_recs_sig = sig
         self._recommendations = recs
-        self.root.after(0, self._render_recommendations)
+        # Top 20 by confidence, picked once per change (same order as a full stable sort)
+        self._top_recs = heapq.nlargest(20, chain.from_iterable(recs.values()), key=lambda r: r.confidence)
+        self._rec_display = {}  # keyed by id(rec); valid while these recs are held
+        self._schedule_render("recs")
+        self._schedule_render("games")  # rec badges live on the game cards
 
     def update_history(self, bets: list):
-        """Refresh the history table."""
-        self.root.after(0, lambda: self._render_history(bets))
+        """
+        Refresh the history table (no-op when the visible rows are unchanged).
+        Pass a new list when bets change; re-sending the same list object is treated as no change.
+        """
+        if bets is self._history_bets and len(bets) == self._history_len:
+            return
+        self._history_len = len(bets)
+        sig = (len(bets), tuple((b["timestamp"], b.get("status"), b.get("pnl")) for b in bets[:50]))
+        if sig == self._last_history_sig:
+            return
+        self._last_history_sig = sig
+        self._history_bets = bets
+        self._schedule_render("history")
 
     def update_status(self, msg: str, color: str = None):
         """Update status indicator."""
-        self._status_var.set(msg)
+        self.call_soon_on_ui(self._status_var.set, msg)
 
     def update_stats(self, stats: dict):
-        """Update header stats."""
+        """Update header stats at idle priority; a burst of calls applies only the latest."""
         if stats:
-            pnl = stats.get("pnl", 0)
-            color = COLORS["green"] if pnl >= 0 else COLORS["red"]
-            self._pnl_var.set(f"30d P&L: {'+' if pnl >= 0 else ''}{pnl:.0f} KES")
-            self._last_refresh.set(f"Updated: {datetime.now().strftime('%H:%M:%S')}")
+            pending = self._pending_stats
+            self._pending_stats = stats
+            if pending is None:
+                self.root.after_idle(self._apply_stats)
+
+    def _apply_stats(self):
+        stats, self._pending_stats = self._pending_stats, None
+        pnl = stats.get("pnl", 0)
+        self._pnl_var.set(f"30d P&L: {'+' if pnl >= 0 else ''}{pnl:.0f} KES")
+        self._last_refresh.set(f"Updated: {datetime.now().strftime('%H:%M:%S')}")
 
     def update_balance(self, balance: float):
-        self._balance_var.set(f"Balance: {balance:.0f} KES")
+        self.call_soon_on_ui(self._balance_var.set, f"Balance: {balance:.0f} KES")
+
+    def call_soon_on_ui(self, fn, *args):
+        """Run fn(*args) on the Tk thread; safe to call from the worker loop."""
+        self.root.after(0, lambda: fn(*args))
 
     # ─────────────────────────────────────────────
     # Rendering
     # ─────────────────────────────────────────────
 
+    def _schedule_render(self, panel: str):
+        """Mark a panel dirty; updates arriving within the debounce window share one redraw."""
+        self._pending.add(panel)
+        if not self._render_scheduled:
+            self._render_scheduled = True
+            self.root.after(config.UI_RENDER_DEBOUNCE_MS, self._flush_renders)
+
+    def _on_map(self, event):
+        """Window restored: render whatever was skipped while it was hidden."""
+        if self._render_deferred and not self._render_scheduled:
+            self._flush_renders()
+
+    def _flush_renders(self):
+        """Render each dirty panel once, from the latest state."""
+        self._render_scheduled = False
+        if self.root.state() == "iconic" or not self.root.winfo_viewable():
+            # Keep the panels dirty; _on_map renders them once on restore
+            self._render_deferred = True
+            return
+        self._render_deferred = False
+        pending, self._pending = self._pending, set()
+        if "games" in pending:
+            self._render_games()
+        if "recs" in pending:
+            self._render_recommendations()
+        if "history" in pending:
+            self._render_history(self._history_bets)
+        # Settle geometry/redraw for everything above in one pass
+        self.root.update_idletasks()
+
     def _render_games(self):
-        """Render live games list."""
-        for w in self._games_scroll.winfo_children():
-            w.destroy()
+        """Render live games list, touching only cards whose game changed."""
+        current_ids = {g.game_id for g in self._games}
+        for game_id in [gid for gid in self._game_widgets if gid not in current_ids]:
+            self._game_widgets.pop(game_id)["card"].destroy()
 
         if not self._games:
-            ctk.CTkLabel(
-                self._games_scroll,
-                text="No live games found.\nCheck scraper configuration.",
-                text_color=COLORS["text_muted"],
-                font=ctk.CTkFont(size=12)
-            ).pack(pady=30)
+            self._games_order = []
+            self._show_placeholder(
+                "games", self._games_scroll.inner,
+                "No live games found.\nCheck scraper configuration.", font="md", pady=30,
+            )
             return
+        self._hide_placeholder("games")
 
         for game in self._games:
-            self._render_game_card(game)
+            widgets = self._game_widgets.get(game.game_id)
+            if widgets is None:
+                widgets = self._game_widgets[game.game_id] = self._create_game_card(game)
+            self._update_game_card(widgets, game)
 
-    def _render_game_card(self, game):
-        """Render a single game card."""
-        has_recs = game.game_id in self._recommendations
+        order = [g.game_id for g in self._games]
+        if order != self._games_order:
+            self._repack([self._game_widgets[gid]["card"] for gid in order], fill="x", padx=5, pady=3)
+            self._games_order = order
 
-        card = ctk.CTkFrame(
-            self._games_scroll,
-            fg_color=COLORS["bg"] if not has_recs else "#0d2818",
-            corner_radius=6,
-            border_color=COLORS["green"] if has_recs else COLORS["border"],
-            border_width=1 if has_recs else 0,
-        )
-        card.pack(fill="x", padx=5, pady=3)
+    def _create_game_card(self, game) -> Dict[str, Any]:
+        """Build one game card's widgets; _update_game_card fills in the live values."""
+        # Border is always drawn; toggling rec state only recolors it
+        card = ctk.CTkFrame(self._games_scroll.inner, corner_radius=6, border_width=1)
 
         top_row = ctk.CTkFrame(card, fg_color="transparent")
         top_row.pack(fill="x", padx=10, pady=(8, 2))
 
         # Teams
-        teams_label = ctk.CTkLabel(
+        ctk.CTkLabel(
             top_row,
             text=f"{game.home_team}  vs  {game.away_team}",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=self.F["md_bold"],
             text_color=COLORS["text"]
-        )
-        teams_label.pack(side="left")
-
-        # Score
-        score_color = COLORS["yellow"] if game.home_score != game.away_score else COLORS["text_muted"]
-        ctk.CTkLabel(
-            top_row,
-            text=f"  {game.home_score} - {game.away_score}",
-            font=ctk.CTkFont(size=13, weight="bold"),
-            text_color=score_color
         ).pack(side="left")
 
-        # Minute badge
+        # Score and minute badge: StringVar-bound, so a tick is a single set()
+        score_var = tk.StringVar(value="")
+        score_lbl = ctk.CTkLabel(top_row, textvariable=score_var, font=self.F["lg_bold"])
+        score_lbl.pack(side="left")
+
+        minute_var = tk.StringVar(value="")
         ctk.CTkLabel(
-            top_row,
-            text=f" {game.minute}'",
-            font=ctk.CTkFont(size=11),
-            text_color=COLORS["red"]
+            top_row, textvariable=minute_var, font=self.F["base"], text_color=COLORS["red"]
         ).pack(side="left")
 
         bottom_row = ctk.CTkFrame(card, fg_color="transparent")
         bottom_row.pack(fill="x", padx=10, pady=(0, 8))
 
         # Site badge
-        site_colors = {"1xbet": COLORS["blue"], "sportpesa": COLORS["orange"]}
         ctk.CTkLabel(
             bottom_row,
             text=game.site.upper(),
-            font=ctk.CTkFont(size=9, weight="bold"),
-            text_color=site_colors.get(game.site, COLORS["text_muted"])
+            font=self.F["xs_bold"],
+            text_color=SITE_COLORS.get(game.site, COLORS["text_muted"])
         ).pack(side="left")
 
-        # League
+        # League (fixed for a game_id, so formatted once here)
         ctk.CTkLabel(
-            bottom_row,
-            text=f"  {game.league[:35]}",
-            font=ctk.CTkFont(size=9),
-            text_color=COLORS["text_muted"]
+            bottom_row, text=f"  {game.league[:35]}", font=self.F["xs"], text_color=COLORS["text_muted"]
         ).pack(side="left")
 
-        # Recommendation badge
-        if has_recs:
-            top_rec = self._recommendations[game.game_id][0]
-            ctk.CTkLabel(
-                bottom_row,
-                text=f"🎯 {top_rec.confidence:.0f}%",
-                font=ctk.CTkFont(size=10, weight="bold"),
-                text_color=COLORS["green"]
-            ).pack(side="right")
+        # Recommendation badge (packed only while the game has recommendations)
+        rec_badge = ctk.CTkLabel(
+            bottom_row, font=self.F["sm_bold"], text_color=COLORS["green"]
+        )
 
-    def _render_recommendations(self):
-        """Render bet recommendations panel."""
-        for w in self._recs_scroll.winfo_children():
-            w.destroy()
-
-        all_recs = []
-        for recs in self._recommendations.values():
-            all_recs.extend(recs)
-
-        # Sort all recommendations globally by confidence
-        all_recs.sort(key=lambda r: r.confidence, reverse=True)
-
-        if not all_recs:
-            ctk.CTkLabel(
-                self._recs_scroll,
-                text="No betting opportunities found.\n\nWaiting for analysis...",
-                text_color=COLORS["text_muted"],
-                font=ctk.CTkFont(size=13)
-            ).pack(pady=40)
-            return
+        return {
+            "card": card, "score_lbl": score_lbl, "score_var": score_var, "minute_var": minute_var,
+            "rec_badge": rec_badge, "_last": {},
+        }
 
-        for rec in all_recs[:20]:  # Show top 20
-            self._render_rec_card(rec)
+    def _update_game_card(self, w: Dict[str, Any], game):
+        """Push a game's current values into its card; unchanged options are skipped."""
+        has_recs = game.game_id in self._recommendations
 
-    def _render_rec_card(self, rec):
-        """Render a single recommendation card."""
-        conf_colors = {
-            "🔥 Very High": COLORS["conf_very_high"],
-            "✅ High": COLORS["conf_high"],
-            "⚡ Medium": COLORS["conf_medium"],
-            "⚠️ Low": COLORS["conf_low"],
-        }
-        conf_color = conf_colors.get(rec.confidence_label, COLORS["text_muted"])
+        self._set(
+            w, "card",
+            fg_color="#0d2818" if has_recs else COLORS["bg"],
+            border_color=COLORS["green"] if has_recs else COLORS["bg"],
+        )
+        score_color = COLORS["yellow"] if game.home_score != game.away_score else COLORS["text_muted"]
+        self._set(w, "score_lbl", text_color=score_color)
+        self._set_var(w, "score_var", f"  {game.home_score} - {game.away_score}")
+        self._set_var(w, "minute_var", f" {game.minute}'")
 
-        card = ctk.CTkFrame(
-            self._recs_scroll,
-            fg_color=COLORS["bg"],
-            corner_radius=8,
-            border_color=conf_color,
-            border_width=1,
+        if has_recs:
+            top_rec = self._recommendations[game.game_id][0]
+            self._set(w, "rec_badge", text=f"🎯 {top_rec.confidence:.0f}%")
+        self._show(w, "rec_badge", has_recs, side="right")
+
+    def _render_recommendations(self):
+        """Render bet recommendations panel; only the rows in view get cards."""
+        self._visible_recs = self._top_recs
+
+        canvas = self._recs_canvas
+        canvas.itemconfigure(self._recs_empty, state="hidden" if self._visible_recs else "normal")
+        canvas.configure(scrollregion=(0, 0, canvas.winfo_width(), REC_ROW_HEIGHT * len(self._visible_recs)))
+        self._layout_recs()
+
+    def _layout_recs(self):
+        """Bind pooled cards to the recommendations inside the viewport and hide the rest."""
+        canvas = self._recs_canvas
+        recs = self._visible_recs
+        view_height = max(canvas.winfo_height(), REC_ROW_HEIGHT)
+        top = max(int(canvas.canvasy(0)), 0)
+        first = top // REC_ROW_HEIGHT
+        last = min(len(recs), (top + view_height) // REC_ROW_HEIGHT + 1)
+
+        # Enough cards to cover a viewport that straddles two partial rows
+        if recs:
+            while len(self._rec_pool) < view_height // REC_ROW_HEIGHT + 2:
+                self._rec_pool.append(self._create_rec_card())
+
+        width = max(canvas.winfo_width() - 10, 1)
+        used = set()
+        for i in range(first, last):
+            slot = i % len(self._rec_pool)  # scrolling one row rebinds one card
+            w = self._rec_pool[slot]
+            used.add(slot)
+            self._update_rec_card(w, recs[i])
+            if w["_last"].get("pos") != (i, width):
+                canvas.coords(w["item"], 5, i * REC_ROW_HEIGHT)
+                canvas.itemconfigure(w["item"], width=width, state="normal")
+                w["_last"]["pos"] = (i, width)
+
+        for slot, w in enumerate(self._rec_pool):
+            if slot not in used and w["_last"].get("pos") is not None:
+                canvas.itemconfigure(w["item"], state="hidden")
+                w["_last"]["pos"] = None
+
+    def _on_recs_scrolled(self, first: str, last: str):
+        """Canvas yscrollcommand: move the scrollbar and re-bind cards to the new rows."""
+        self._recs_scrollbar.set(first, last)
+        self._layout_recs()
+
+    def _create_rec_card(self) -> Dict[str, Any]:
+        """Build one pooled recommendation card; _update_rec_card binds it to a rec."""
+        card = ctk.CTkFrame(self._recs_canvas, fg_color=COLORS["bg"], corner_radius=8, border_width=1)
+        w: Dict[str, Any] = {"card": card, "rec": None, "_last": {}}
+        w["item"] = self._recs_canvas.create_window(
+            0, 0, window=card, anchor="nw", height=REC_ROW_HEIGHT - REC_CARD_GAP, state="hidden"
         )
-        card.pack(fill="x", padx=5, pady=4)
 
-        # Header row
-        h = ctk.CTkFrame(card, fg_color="transparent")
-        h.pack(fill="x", padx=12, pady=(10, 4))
+        # One flat, fixed-size grid per card (no row frames): showing/hiding
+        # labels never re-requests geometry
+        card.grid_propagate(False)
+        card.grid_columnconfigure((0, 1, 2, 3), weight=1)
+        card.grid_rowconfigure(6, weight=1)
 
-        ctk.CTkLabel(
-            h,
-            text=f"{rec.game.home_team} vs {rec.game.away_team}",
-            font=ctk.CTkFont(size=12, weight="bold"),
-            text_color=COLORS["text"]
-        ).pack(side="left")
+        # Header row
+        w["teams_lbl"] = ctk.CTkLabel(card, font=self.F["md_bold"], text_color=COLORS["text"])
+        w["teams_lbl"].grid(row=0, column=0, sticky="w", padx=(12, 0), pady=(10, 4))
 
-        ctk.CTkLabel(
-            h,
-            text=f"{rec.game.home_score}-{rec.game.away_score}  {rec.game.minute}'",
-            font=ctk.CTkFont(size=11),
-            text_color=COLORS["yellow"]
-        ).pack(side="left", padx=10)
+        w["score_lbl"] = ctk.CTkLabel(card, font=self.F["base"], text_color=COLORS["yellow"])
+        w["score_lbl"].grid(row=0, column=1, sticky="w", padx=10, pady=(10, 4))
 
         # Confidence badge
-        ctk.CTkLabel(
-            h,
-            text=f"{rec.confidence_label}  {rec.confidence:.0f}%",
-            font=ctk.CTkFont(size=11, weight="bold"),
-            text_color=conf_color
-        ).pack(side="right")
+        w["conf_var"] = tk.StringVar(value="")
+        w["conf_badge"] = ctk.CTkLabel(card, textvariable=w["conf_var"], font=self.F["base_bold"])
+        w["conf_badge"].grid(row=0, column=3, sticky="e", padx=(0, 12), pady=(10, 4))
 
         # Bet details row
-        d = ctk.CTkFrame(card, fg_color="transparent")
-        d.pack(fill="x", padx=12, pady=2)
+        w["bet_lbl"] = ctk.CTkLabel(card, font=self.F["lg_bold"])
+        w["bet_lbl"].grid(row=1, column=0, sticky="w", padx=(12, 0), pady=2)
 
-        ctk.CTkLabel(
-            d,
-            text=f"BET: {rec.bet_label}",
-            font=ctk.CTkFont(size=13, weight="bold"),
-            text_color=conf_color
-        ).pack(side="left")
+        w["odds_lbl"] = ctk.CTkLabel(card, font=self.F["md"], text_color=COLORS["text"])
+        w["odds_lbl"].grid(row=1, column=1, sticky="w", padx=10, pady=2)
 
-        ctk.CTkLabel(
-            d,
-            text=f"@ {rec.odds:.2f}",
-            font=ctk.CTkFont(size=12),
-            text_color=COLORS["text"]
-        ).pack(side="left", padx=10)
+        w["edge_lbl"] = ctk.CTkLabel(card, font=self.F["base"])
+        w["edge_lbl"].grid(row=1, column=2, sticky="w", padx=10, pady=2)
 
-        edge_color = COLORS["green"] if rec.edge > 0 else COLORS["red"]
-        ctk.CTkLabel(
-            d,
-            text=f"Edge: {'+' if rec.edge > 0 else ''}{rec.edge*100:.1f}%",
-            font=ctk.CTkFont(size=11),
-            text_color=edge_color
-        ).pack(side="left", padx=10)
-
-        ctk.CTkLabel(
-            d,
-            text=f"Stake: {rec.recommended_stake:.0f} KES",
-            font=ctk.CTkFont(size=11, weight="bold"),
-            text_color=COLORS["blue"]
-        ).pack(side="right")
+        w["stake_lbl"] = ctk.CTkLabel(card, font=self.F["base_bold"], text_color=COLORS["blue"])
+        w["stake_lbl"].grid(row=1, column=3, sticky="e", padx=(0, 12), pady=2)
 
         # Analysis row
-        a = ctk.CTkFrame(card, fg_color="transparent")
-        a.pack(fill="x", padx=12, pady=2)
-
-        ctk.CTkLabel(
-            a,
-            text=f"Model: {rec.model_probability*100:.1f}%  |  Bookmaker: {rec.implied_probability*100:.1f}%  "
-                 f"|  xG: {rec.home_xg:.1f}-{rec.away_xg:.1f}  |  Predicted: {rec.predicted_score}",
-            font=ctk.CTkFont(size=10),
-            text_color=COLORS["text_muted"]
-        ).pack(side="left")
-
-        # Reasons (first 2)
-        if rec.reasons:
-            r_frame = ctk.CTkFrame(card, fg_color="transparent")
-            r_frame.pack(fill="x", padx=12, pady=(2, 4))
-            for reason in rec.reasons[:2]:
-                ctk.CTkLabel(
-                    r_frame,
-                    text=f"• {reason}",
-                    font=ctk.CTkFont(size=10),
-                    text_color=COLORS["text_muted"],
-                    wraplength=700,
-                ).pack(anchor="w")
-
-        # Warnings
-        for w in rec.warnings[:1]:
-            ctk.CTkLabel(
-                card,
-                text=w,
-                font=ctk.CTkFont(size=10),
-                text_color=COLORS["yellow"]
-            ).pack(anchor="w", padx=12, pady=(0, 2))
-
-        # Action buttons
-        btn_row = ctk.CTkFrame(card, fg_color="transparent")
-        btn_row.pack(fill="x", padx=12, pady=(4, 10))
-
-        # Manual bet button
-        ctk.CTkButton(
-            btn_row,
-            text=f"📋 Manual Bet ({rec.recommended_stake:.0f} KES)",
-            command=lambda r=rec: self._manual_bet_click(r),
+        w["analysis_lbl"] = ctk.CTkLabel(card, font=self.F["sm"], text_color=COLORS["text_muted"])
+        w["analysis_lbl"].grid(row=2, column=0, columnspan=4, sticky="w", padx=12, pady=2)
+
+        # Reasons (first 2) and first warning; gridded once, then grid_remove()d while empty
+        for i in range(2):
+            lbl = w[f"reason_{i}"] = ctk.CTkLabel(card, font=self.F["sm"], text_color=COLORS["text_muted"])
+            lbl.grid(row=3 + i, column=0, columnspan=4, sticky="w", padx=12, pady=(2, 0))
+            lbl.grid_remove()
+
+        w["warn_lbl"] = ctk.CTkLabel(card, font=self.F["sm"], text_color=COLORS["yellow"])
+        w["warn_lbl"].grid(row=5, column=0, columnspan=4, sticky="w", padx=12, pady=(2, 2))
+        w["warn_lbl"].grid_remove()
+
+        # Action row, pinned to the bottom; the manual bet button reads the card's current rec
+        w["bet_btn"] = ctk.CTkButton(
+            card,
+            command=lambda: self._manual_bet_click(w["rec"]),
             width=180, height=28,
             fg_color=COLORS["surface"],
-            border_color=conf_color,
             border_width=1,
-            text_color=conf_color,
             hover_color=COLORS["border"],
-            font=ctk.CTkFont(size=11),
-        ).pack(side="left")
+            font=self.F["base"],
+        )
+        w["bet_btn"].grid(row=6, column=0, sticky="sw", padx=(12, 0), pady=(4, 10))
+
+        w["auto_lbl"] = ctk.CTkLabel(
+            card,
+            text="🤖 AUTO-BET ELIGIBLE",
+            font=self.F["sm_bold"],
+            text_color=COLORS["green"]
+        )
+        w["auto_lbl"].grid(row=6, column=1, columnspan=2, sticky="sw", padx=15, pady=(4, 10))
+        w["auto_lbl"].grid_remove()
+
+        w["site_lbl"] = ctk.CTkLabel(card, font=self.F["xs"], text_color=COLORS["text_muted"])
+        w["site_lbl"].grid(row=6, column=3, sticky="se", padx=(0, 12), pady=(4, 10))
+
+        return w
+
+    def _rec_strings(self, rec) -> Dict[str, Any]:
+        """Display strings/colors for a rec, formatted once per recommendations update."""
+        cached = self._rec_display.get(id(rec))
+        if cached is not None:
+            return cached
+
+        game = rec.game
+        cached = self._rec_display[id(rec)] = {
+            "conf_color": CONF_COLORS[rec.confidence_tier],
+            "teams": f"{game.home_team} vs {game.away_team}",
+            "site": game.site.upper(),
+            "score": f"{game.home_score}-{game.away_score}  {game.minute}'",
+            "conf": f"{rec.confidence_label}  {rec.confidence:.0f}%",
+            "bet": f"BET: {rec.bet_label}",
+            "odds": f"@ {rec.odds:.2f}",
+            "edge": f"Edge: {'+' if rec.edge > 0 else ''}{rec.edge*100:.1f}%",
+            "edge_color": COLORS["green"] if rec.edge > 0 else COLORS["red"],
+            "stake": f"Stake: {rec.recommended_stake:.0f} KES",
+            "analysis": f"Model: {rec.model_probability*100:.1f}%  |  Bookmaker: {rec.implied_probability*100:.1f}%  "
+                        f"|  xG: {rec.home_xg:.1f}-{rec.away_xg:.1f}  |  Predicted: {rec.predicted_score}",
+            "reasons": tuple(f"• {reason}" for reason in rec.reasons[:2]),
+            "warning": rec.warnings[0] if rec.warnings else None,
+            "button": f"📋 Manual Bet ({rec.recommended_stake:.0f} KES)",
+            "auto": rec.is_auto_bettable,
+        }
+        return cached
 
-        if rec.is_auto_bettable:
-            ctk.CTkLabel(
-                btn_row,
-                text="🤖 AUTO-BET ELIGIBLE",
-                font=ctk.CTkFont(size=10, weight="bold"),
-                text_color=COLORS["green"]
-            ).pack(side="left", padx=15)
+    def _update_rec_card(self, w: Dict[str, Any], rec):
+        """Push a recommendation's current values into its card; unchanged options are skipped."""
+        if w["rec"] is rec:
+            return
+        w["rec"] = rec
+        d = self._rec_strings(rec)
+        conf_color = d["conf_color"]
+
+        self._set(w, "card", border_color=conf_color)
+        self._set(w, "teams_lbl", text=d["teams"])
+        self._set(w, "site_lbl", text=d["site"])
+        self._set(w, "score_lbl", text=d["score"])
+        self._set(w, "conf_badge", text_color=conf_color)
+        self._set_var(w, "conf_var", d["conf"])
+        self._set(w, "bet_lbl", text=d["bet"], text_color=conf_color)
+        self._set(w, "odds_lbl", text=d["odds"])
+        self._set(w, "edge_lbl", text=d["edge"], text_color=d["edge_color"])
+        self._set(w, "stake_lbl", text=d["stake"])
+        self._set(w, "analysis_lbl", text=d["analysis"])
+
+        # Reasons / warning occupy fixed grid rows; empty ones are grid_remove()d
+        reasons, warning = d["reasons"], d["warning"]
+        for i in range(2):
+            name = f"reason_{i}"
+            if i < len(reasons):
+                # Wrapping makes Tk measure the text; only long reasons need it
+                self._set(w, name, text=reasons[i], wraplength=700 if len(reasons[i]) > 90 else 0)
+            self._show_gridded(w, name, i < len(reasons))
+        if warning:
+            self._set(w, "warn_lbl", text=warning)
+        self._show_gridded(w, "warn_lbl", bool(warning))
+
+        self._set(w, "bet_btn", text=d["button"], border_color=conf_color, text_color=conf_color)
+        self._show_gridded(w, "auto_lbl", d["auto"])
+
+    # ── Widget-reuse helpers ──
+
+    @staticmethod
+    def _set(w: Dict[str, Any], name: str, **options):
+        """configure() w[name] with only the options whose value changed since the last call."""
+        last = w["_last"].setdefault(name, {})
+        changed = {k: v for k, v in options.items() if last.get(k) != v}
+        if changed:
+            w[name].configure(**changed)
+            last.update(changed)
+
+    @staticmethod
+    def _set_var(w: Dict[str, Any], name: str, value: str):
+        """set() the StringVar w[name] only when its value changed."""
+        if w["_last"].get(name) != value:
+            w[name].set(value)
+            w["_last"][name] = value
+
+    @staticmethod
+    def _show(w: Dict[str, Any], name: str, visible: bool, **pack_options):
+        """Pack or forget w[name] when its visibility changes."""
+        key = name + ":shown"
+        if w["_last"].get(key, False) != visible:
+            if visible:
+                w[name].pack(**pack_options)
+            else:
+                w[name].pack_forget()
+            w["_last"][key] = visible
+
+    @staticmethod
+    def _show_gridded(w: Dict[str, Any], name: str, visible: bool):
+        """grid() or grid_remove() w[name] when its visibility changes; grid options are kept."""
+        key = name + ":shown"
+        if w["_last"].get(key, False) != visible:
+            if visible:
+                w[name].grid()
+            else:
+                w[name].grid_remove()
+            w["_last"][key] = visible
+
+    @staticmethod
+    def _repack(cards: list, **pack_options):
+        """Re-pack cards in display order (only needed when the order changed)."""
+        for card in cards:
+            card.pack_forget()
+        for card in cards:
+            card.pack(**pack_options)
+
+    def _show_placeholder(self, panel: str, parent, text: str, font: str, pady: int):
+        """Show the panel's 'nothing here' label, creating it on first use."""
+        label = self._placeholders.get(panel)
+        if label is None:
+            label = self._placeholders[panel] = ctk.CTkLabel(
+                parent, text=text, text_color=COLORS["text_muted"], font=self.F[font]
+            )
+        if not label.winfo_manager():
+            label.pack(pady=pady)
 
-        ctk.CTkLabel(
-            btn_row,
-            text=rec.game.site.upper(),
-            font=ctk.CTkFont(size=9),
-            text_color=COLORS["text_muted"]
-        ).pack(side="right")
+    def _hide_placeholder(self, panel: str):
+        label = self._placeholders.get(panel)
+        if label is not None:
+            label.pack_forget()
 
     def _render_history(self, bets: list):
-        """Render bet history table."""
-        for row in self._history_tree.get_children():
-            self._history_tree.delete(row)
-
+        """Render bet history table, inserting/updating/deleting only the rows that changed."""
+        if self._history_tree is None:
+            self._build_history_tree()
+        tree = self._history_tree
+        rows = {}
         for bet in bets[:50]:
-            status = bet.get("status", "pending")
-            pnl = bet.get("pnl")
-            pnl_str = f"+{pnl:.0f}" if pnl and pnl > 0 else (f"{pnl:.0f}" if pnl else "-")
-
-            self._history_tree.insert("", "end", values=(
-                bet["timestamp"][:16].replace("T", " "),
-                bet["auto"],
-                bet["match"][:30],
-                bet["bet"],
-                f"{bet['odds']:.2f}",
-                f"{bet['stake']:.0f}",
-                f"{bet['confidence']:.0f}%",
-                status.upper(),
-                pnl_str,
-            ))
+            rows[(bet["timestamp"], bet["match"], bet["bet"])] = _history_row(
+                bet["timestamp"], bet["auto"], bet["match"], bet["bet"],
+                bet["odds"], bet["stake"], bet["confidence"],
+                bet.get("status", "pending"), bet.get("pnl"),
+            )
+
+        removed = [self._history_iids.pop(key) for key in list(self._history_iids) if key not in rows]
+        if removed:
+            tree.delete(*removed)
+            for iid in removed:
+                del self._history_values[iid]
+        kept_order = [key for key in self._history_order if key in rows]
+
+        for index, (key, values) in enumerate(rows.items()):
+            iid = self._history_iids.get(key)
+            if iid is None:
+                iid = self._history_iids[key] = tree.insert("", index, values=values)
+            elif self._history_values[iid] != values:
+                tree.item(iid, values=values)
+            self._history_values[iid] = values
+
+        # Existing rows normally keep their relative order; re-seat them if not
+        order = list(rows)
+        if kept_order != [key for key in order if key in kept_order]:
+            for index, key in enumerate(order):
+                tree.move(self._history_iids[key], "", index)
+        self._history_order = order
 
     # ─────────────────────────────────────────────
     # Event handlers
@@ -592,24 +902,23 @@ class SoccerBotDashboard:
     def _toggle_auto_bet(self):
         enabled = self._auto_bet_var.get()
         if enabled:
-            confirmed = messagebox.askyesno(
+            confirmed = self._confirm(
                 "Enable Auto-Bet",
                 f"⚠️ CAUTION: Auto-bet will automatically place bets above "
                 f"{config.AUTO_BET_THRESHOLD}% confidence.\n\n"
                 f"Real money will be spent. Daily limit: {config.DAILY_LOSS_LIMIT} KES.\n\n"
                 f"Are you sure you want to enable auto-betting?",
-                icon="warning"
+                warning=True,
             )
             if not confirmed:
                 self._auto_bet_var.set(False)
                 return
         
-        if self.on_auto_bet_toggle:
-            self.on_auto_bet_toggle(enabled)
+        self._dispatch(self.on_auto_bet_toggle, enabled)
 
     def _manual_bet_click(self, rec):
         """Show manual bet confirmation dialog."""
-        confirmed = messagebox.askyesno(
+        confirmed = self._confirm(
             "Manual Bet Confirmation",
             f"Place bet manually:\n\n"
             f"Match: {rec.game.home_team} vs {rec.game.away_team}\n"
@@ -619,13 +928,106 @@ class SoccerBotDashboard:
             f"Suggested Stake: {rec.recommended_stake:.0f} KES\n\n"
             f"Record this bet in history?",
         )
-        if confirmed and self.on_manual_bet:
-            self.on_manual_bet(rec)
+        if confirmed:
+            self._dispatch(self.on_manual_bet, rec)
+
+    def _confirm(self, title: str, message: str, warning: bool = False) -> bool:
+        """Modal yes/no prompt on the pooled dialog; blocks (event loop still running) until answered."""
+        if self._confirm_dlg is None:
+            self._build_confirm_dialog()
+        dlg = self._confirm_dlg
+        dlg.title(title)
+        self._confirm_msg.set(message)
+        self._confirm_result.set(-1)
+
+        # Warning style: icon above the message, Yes in red
+        if warning:
+            self._confirm_icon.pack(pady=(16, 0), before=self._confirm_label)
+        else:
+            self._confirm_icon.pack_forget()
+        self._confirm_yes.configure(fg_color=COLORS["red"] if warning else COLORS["green"])
+
+        dlg.deiconify()
+        dlg.lift()
+        try:
+            dlg.wait_visibility()  # grab_set fails on a window that is not mapped yet
+            dlg.grab_set()
+            dlg.wait_variable(self._confirm_result)
+        finally:
+            dlg.grab_release()
+            dlg.withdraw()
+        return self._confirm_result.get() == 1
+
+    def _build_confirm_dialog(self):
+        """Create the confirmation dialog once; _confirm shows and hides it."""
+        self._confirm_msg = tk.StringVar(value="")
+        self._confirm_result = tk.IntVar(value=-1)
+
+        dlg = ctk.CTkToplevel(self.root)
+        dlg.withdraw()
+        dlg.transient(self.root)
+        dlg.resizable(False, False)
+        dlg.configure(fg_color=COLORS["surface"])
+        dlg.protocol("WM_DELETE_WINDOW", lambda: self._confirm_result.set(0))
+
+        self._confirm_icon = ctk.CTkLabel(
+            dlg, text="⚠️", font=self.F["mono_logo"], text_color=COLORS["yellow"]
+        )
+        self._confirm_label = ctk.CTkLabel(
+            dlg, textvariable=self._confirm_msg,
+            font=self.F["md"],
+            text_color=COLORS["text"],
+            justify="left",
+            wraplength=420,
+        )
+        self._confirm_label.pack(padx=20, pady=(20, 12))
+
+        buttons = ctk.CTkFrame(dlg, fg_color="transparent")
+        buttons.pack(pady=(0, 16))
+        self._confirm_yes = ctk.CTkButton(
+            buttons, text="Yes", width=100,
+            command=lambda: self._confirm_result.set(1),
+            fg_color=COLORS["green"],
+            hover_color=COLORS["border"],
+            font=self.F["md_bold"],
+        )
+        self._confirm_yes.pack(side="left", padx=8)
+        ctk.CTkButton(
+            buttons, text="No", width=100,
+            command=lambda: self._confirm_result.set(0),
+            fg_color=COLORS["surface"],
+            border_color=COLORS["border"],
+            border_width=1,
+            hover_color=COLORS["border"],
+            font=self.F["md"],
+        ).pack(side="left", padx=8)
+
+        self._confirm_dlg = dlg
 
     def _force_refresh(self):
-        if self.on_force_refresh:
-            self.on_force_refresh()
+        self._dispatch(self.on_force_refresh)
+
+    def _dispatch(self, callback, *args):
+        """Hand a callback to the worker loop; the Tk thread returns immediately."""
+        if callback is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._invoke(callback, *args), self._loop)
+        future.add_done_callback(self._log_callback_error)
+
+    @staticmethod
+    async def _invoke(callback, *args):
+        result = callback(*args)
+        if inspect.isawaitable(result):
+            await result
+
+    @staticmethod
+    def _log_callback_error(future):
+        if not future.cancelled() and future.exception():
+            logger.error(f"❌ Dashboard callback failed: {future.exception()}")
 
     def run(self):
         """Start the UI event loop."""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
@@ -1,115 +1,51 @@
 import asyncio
+import dataclasses
+import hashlib
 import json
 import logging
 import os
+import time
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Optional
 from aiohttp import web
 
 logger = logging.getLogger(__name__)
 
-class SoccerBotWebServer:
-    """
-    web-based UI for SoccerBot.
-    Serves a dashboard on localhost:8080.
-    """
-    
-    def __init__(self, port=8080):
-        self.port = port
-        self.app = web.Application()
-        self.app.router.add_get('/', self.handle_index)
-        self.app.router.add_get('/api/data', self.handle_data)
-        self.app.router.add_post('/api/bet', self.handle_manual_bet)
-        self.app.router.add_post('/api/toggle_auto', self.handle_toggle_auto)
-        self.app.router.add_post('/api/recheck_login', self.handle_recheck)
-        self.app.router.add_post('/api/strategy', self.handle_strategy)
-        
-        self.data = {
-            "games": [],
-            "recommendations": {},
-            "history": [],
-            "stats": {"pnl": 0, "win_rate": 0, "total_bets": 0},
-            "status": "Starting up...",
-            "scraper_statuses": {},
-            "strategy": {
-                "mode": "conservative",
-                "stats": {}
-            }
-        }
-        
-        # Callbacks
-        self.on_manual_bet = None
-        self.on_auto_bet_toggle = None
-        self.on_force_refresh = None
-        self.on_recheck_login = None
-        self.on_strategy_change = None
-        
-        self.runner = None
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-    async def start(self):
-        """Start the aiohttp server."""
-        self.runner = web.AppRunner(self.app)
-        await self.runner.setup()
-        site = web.TCPSite(self.runner, 'localhost', self.port)
-        await site.start()
-        logger.info(f"🌐 Dashboard available at http://localhost:{self.port}")
 
-    async def stop(self):
-        if self.runner:
-            await self.runner.cleanup()
+def _record_to_dict(obj: Any) -> dict:
+    """Shallow field dict of a record; works for slotted dataclasses, unlike vars()."""
+    if dataclasses.is_dataclass(obj):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    return vars(obj)
 
-    def update_status(self, status: str):
-        self.data["status"] = status
 
-    def update_games(self, games):
-        # Convert LiveGame objects to dicts for JSON
-        self.data["games"] = [vars(g) for g in games]
+def _json_default(obj: Any) -> Any:
+    """Encode the non-JSON types that end up in dashboard data."""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if dataclasses.is_dataclass(obj) or hasattr(obj, "__dict__"):
+        return _record_to_dict(obj)
+    return str(obj)
 
-    def update_recommendations(self, recommendations):
-        # Convert BetRecommendation objects to dicts
-        serializable = {}
-        for game_id, recs in recommendations.items():
-            serializable[game_id] = [self._rec_to_dict(r) for r in recs]
-        self.data["recommendations"] = serializable
 
-    def update_history(self, history):
-        self.data["history"] = history
-
-    def update_stats(self, stats):
-        self.data["stats"] = stats
-
-    def update_scraper_statuses(self, statuses):
-        self.data["scraper_statuses"] = statuses
-
-    def update_strategy_stats(self, strategy_stats):
-        self.data["strategy"]["stats"] = strategy_stats
-
-    def run(self):
-        """
-        No-op for web server (it's async).
-        In main.py we'll just keep the loop alive.
-        """
-        # We don't block here like Tkinter.run()
-        pass
+def _encode_json(data: Any) -> bytes:
+    """Serialize `data` to UTF-8 JSON bytes, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, default=_json_default).encode("utf-8")
 
-    def _rec_to_dict(self, r):
-        # Flatten for frontend
-        d = vars(r).copy()
-        # Add game info into the flat dict for easier access on frontend
-        if hasattr(r, 'game'):
-            d['game_id'] = r.game.game_id
-            d['home_team'] = r.game.home_team
-            d['away_team'] = r.game.away_team
-            d['home_score'] = r.game.home_score
-            d['away_score'] = r.game.away_score
-            d['minute'] = r.game.minute
-            d['league'] = r.game.league
-            d['site'] = r.game.site
-        
-        if 'game' in d:
-            del d['game'] # Don't nest the whole game object again
-        return d
 
-    async def handle_index(self, request):
-        html = """
+# Dashboard page served at '/'; encoded once per server (see SoccerBotWebServer.__init__)
+_INDEX_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -642,10 +578,166 @@ class SoccerBotWebServer:
 </body>
 </html>
         """
-        return web.Response(text=html, content_type='text/html')
+
+
+class SoccerBotWebServer:
+    """
+    web-based UI for SoccerBot.
+    Serves a dashboard on localhost:8080.
+    """
+    
+    # Seconds since the last /api/data poll before the dashboard counts as unwatched
+    CLIENT_IDLE_TIMEOUT = 30
+
+    # update_batch() section name -> update method
+    _BATCH_UPDATERS = {
+        "status": "update_status",
+        "games": "update_games",
+        "recommendations": "update_recommendations",
+        "history": "update_history",
+        "stats": "update_stats",
+        "scraper_statuses": "update_scraper_statuses",
+        "strategy_stats": "update_strategy_stats",
+    }
+    
+    def __init__(self, port=8080):
+        self.port = port
+        self.app = web.Application()
+        self.app.router.add_get('/', self.handle_index)
+        self.app.router.add_get('/api/data', self.handle_data)
+        self.app.router.add_post('/api/bet', self.handle_manual_bet)
+        self.app.router.add_post('/api/toggle_auto', self.handle_toggle_auto)
+        self.app.router.add_post('/api/recheck_login', self.handle_recheck)
+        self.app.router.add_post('/api/strategy', self.handle_strategy)
+        
+        self.data = {
+            "games": [],
+            "recommendations": {},
+            "history": [],
+            "stats": {"pnl": 0, "win_rate": 0, "total_bets": 0},
+            "status": "Starting up...",
+            "scraper_statuses": {},
+            "strategy": {
+                "mode": "conservative",
+                "stats": {}
+            }
+        }
+        
+        # Callbacks
+        self.on_manual_bet = None
+        self.on_auto_bet_toggle = None
+        self.on_force_refresh = None
+        self.on_recheck_login = None
+        self.on_strategy_change = None
+        
+        self.runner = None
+        self._last_client_poll = 0.0
+        self._payload: Optional[bytes] = None  # Encoded self.data, rebuilt after updates
+        self._index_bytes = _INDEX_HTML.encode("utf-8")
+        self._index_etag = hashlib.blake2b(self._index_bytes, digest_size=8).hexdigest()
+
+    async def start(self):
+        """Start the aiohttp server."""
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, 'localhost', self.port)
+        await site.start()
+        logger.info(f"🌐 Dashboard available at http://localhost:{self.port}")
+
+    async def stop(self):
+        if self.runner:
+            await self.runner.cleanup()
+
+    @property
+    def has_active_clients(self) -> bool:
+        """True while a browser tab has polled /api/data recently."""
+        return time.monotonic() - self._last_client_poll < self.CLIENT_IDLE_TIMEOUT
+
+    def update_status(self, status: str):
+        self.data["status"] = status
+        self._payload = None
+
+    def update_games(self, games):
+        # Convert LiveGame objects to dicts for JSON
+        self.data["games"] = [_record_to_dict(g) for g in games]
+        self._payload = None
+
+    def update_recommendations(self, recommendations):
+        # Convert BetRecommendation objects to dicts
+        serializable = {}
+        for game_id, recs in recommendations.items():
+            serializable[game_id] = [self._rec_to_dict(r) for r in recs]
+        self.data["recommendations"] = serializable
+        self._payload = None
+
+    def update_history(self, history):
+        self.data["history"] = history
+        self._payload = None
+
+    def update_stats(self, stats):
+        self.data["stats"] = stats
+        self._payload = None
+
+    def update_scraper_statuses(self, statuses):
+        self.data["scraper_statuses"] = statuses
+        self._payload = None
+
+    def update_strategy_stats(self, strategy_stats):
+        self.data["strategy"]["stats"] = strategy_stats
+        self._payload = None
+
+    def update_batch(self, **sections):
+        """
+        Apply several sections at once, e.g. update_batch(games=..., stats=...).
+        Section names match the update_* methods; the payload is encoded once
+        on the next poll.
+        """
+        for name, value in sections.items():
+            getattr(self, self._BATCH_UPDATERS[name])(value)
+
+    def run(self):
+        """
+        No-op for web server (it's async).
+        In main.py we'll just keep the loop alive.
+        """
+        # We don't block here like Tkinter.run()
+        pass
+
+    def _rec_to_dict(self, r):
+        # Flatten for frontend
+        d = _record_to_dict(r)
+        # Add game info into the flat dict for easier access on frontend
+        if hasattr(r, 'game'):
+            d['game_id'] = r.game.game_id
+            d['home_team'] = r.game.home_team
+            d['away_team'] = r.game.away_team
+            d['home_score'] = r.game.home_score
+            d['away_score'] = r.game.away_score
+            d['minute'] = r.game.minute
+            d['league'] = r.game.league
+            d['site'] = r.game.site
+        
+        if 'game' in d:
+            del d['game'] # Don't nest the whole game object again
+        return d
+
+    async def handle_index(self, request):
+        # Static page: answer revalidations with 304 and no body
+        if any(etag.value in (self._index_etag, "*") for etag in request.if_none_match or ()):
+            return web.Response(status=304, headers={"ETag": f'"{self._index_etag}"'})
+        return web.Response(
+            body=self._index_bytes,
+            content_type="text/html",
+            charset="utf-8",
+            headers={"ETag": f'"{self._index_etag}"', "Cache-Control": "no-cache"},
+        )
 
     async def handle_data(self, request):
-        return web.json_response(self.data)
+        self._last_client_poll = time.monotonic()
+        # Encode once per update instead of once per poll
+        if self._payload is None:
+            self._payload = _encode_json(self.data)
+        return web.Response(body=self._payload, content_type="application/json")
 
     async def handle_manual_bet(self, request):
         try:
@@ -714,6 +806,7 @@ class SoccerBotWebServer:
             if self.on_strategy_change:
                 self.on_strategy_change(mode)
                 self.data["strategy"]["mode"] = mode
+                self._payload = None
                 return web.json_response({"status": "ok", "mode": mode})
             
             return web.json_response({"status": "error", "message": "Callback not registered"}, status=500)